@@ -60,6 +60,16 @@ AUDIT_LOG_SKIP_POS = False        # ← 기본 False: BUY_SKIP_POS는 DB에 남
 AUDIT_SKIP_POS_SAMPLE_N = 0       # 0이면 샘플링 안함(=완전 비활성), n>0이면 n bar마다 1회
 AUDIT_DEDUP_PER_BAR = True        # 같은 bar 중복 적재 방지
 
+# MACDStrategy.log_events 보관 최대 봉 수 (초과 시 오래된 것부터 덮어씀, 0/None = 무제한)
+LOG_EVENTS_MAX = 100_000
+
+# 감사 로그(audit_buy_eval/audit_sell_eval) 일괄 적재 단위 (행 수, SELL 트리거 행·마지막 봉에서는 즉시 모두 적재)
+#  - 적재 사이 메모리에 머무는 행 수 상한 = 프로세스가 비정상 종료될 때 유실될 수 있는 최대 행 수
+AUDIT_BATCH_ROWS = 50
+
+# 컨디션 파일 변경 확인(stat) 주기 (봉 수, 마지막 봉에서는 항상 확인)
+CONDITIONS_RELOAD_EVERY_BARS = 300
+
 # 감사 로그 튜닝 파라미터
 AUDIT_BUY_SAMPLE_N = 1          # 동일 상태가 지속되어도 N bar마다 1회 기록
 AUDIT_BUY_COOLDOWN_BARS = 0     # 동일 상태에서 최소 대기 bar 수 (0 = 샘플링 제거, 모든 봉 기록)
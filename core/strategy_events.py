@@ -0,0 +1,289 @@
+"""
+전략 이벤트 버퍼 - log_events / trade_events 를 컬럼형(SoA) 배열로 적재
+매 봉 튜플/매 트레이드 dict 생성 대신 numpy 컬럼에 인덱스로 기록한다.
+
+백워드 호환:
+- LogEventBuffer 는 (bar, "LOG", cross, macd, signal, price) 튜플 시퀀스처럼 동작
+- TradeEventBuffer 는 {"bar":..., "type":..., ...} dict 시퀀스처럼 동작
+- len / 반복 / reversed / 인덱싱 / 슬라이싱 지원 (요소는 접근 시점에 생성)
+- to_frame() 으로 한 번에 DataFrame 변환
+- maxlen 지정 시 링 버퍼: 가득 차면 가장 오래된 이벤트부터 덮어씀 (deque(maxlen) 과 같은 의미)
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+
+# 크로스 상태 코드 (last_cross_type 문자열 ↔ 정수)
+CROSS_TYPES = ("Golden", "Dead", "Pending", "Neutral")
+CROSS_ID = {name: i for i, name in enumerate(CROSS_TYPES)}
+
+TRADE_TYPES = ("BUY", "SELL")
+TRADE_TYPE_ID = {name: i for i, name in enumerate(TRADE_TYPES)}
+
+# 고정 사유 코드 (BUY 사유는 활성 조건 조합이라 동적으로 추가 인터닝)
+TRADE_REASONS = (
+    "BUY",
+    "Stop Loss",
+    "Trailing Stop",
+    "Take Profit",
+    "MACD Negative",
+    "Signal Negative",
+    "Dead Cross",
+)
+REASON_ID = {name: i for i, name in enumerate(TRADE_REASONS)}
+
+TRADE_FIELDS = (
+    "bar", "type", "reason", "timestamp", "price", "macd", "signal",
+    "entry_price", "entry_bar", "bars_held", "tp", "sl", "highest",
+    "ts_pct", "ts_armed",
+)
+
+_NO_BAR = -1
+
+
+def _opt_float(v):
+    """None → NaN (선택 값 컬럼용)"""
+    return np.nan if v is None else v
+
+
+def _opt_out(v):
+    """NaN → None (dict 복원용)"""
+    v = float(v)
+    return None if v != v else v
+
+
+class _ColumnBuffer(ABC):
+    """컬럼 배열 공통: 용량 관리 + 시퀀스 프로토콜 (하위 클래스는 _alloc / _row 구현 필수)"""
+
+    _columns: tuple = ()
+
+    def __init__(self, capacity: int, maxlen: int | None = None):
+        self._maxlen = int(maxlen) if maxlen else None
+        cap = max(int(capacity), 1)
+        self._cap = min(cap, self._maxlen) if self._maxlen else cap
+        self._n = 0
+        self._start = 0   # 링 모드에서 가장 오래된 이벤트의 물리 위치
+        self._alloc(self._cap)
+
+    @abstractmethod
+    def _alloc(self, cap: int):
+        """_columns 의 각 컬럼 배열을 cap 크기로 새로 할당"""
+        pass
+
+    def _grow(self):
+        """용량 초과 시 2배로 확장 (기존 값 보존, maxlen 상한)"""
+        old = {c: getattr(self, c) for c in self._columns}
+        self._cap *= 2
+        if self._maxlen:
+            self._cap = min(self._cap, self._maxlen)
+        self._alloc(self._cap)
+        for c, arr in old.items():
+            getattr(self, c)[: self._n] = arr[: self._n]
+
+    def _next_slot(self) -> int:
+        """다음 기록 위치(물리 인덱스). 가득 찬 링 버퍼면 가장 오래된 칸을 덮어씀"""
+        n = self._n
+        if n >= self._cap:
+            if self._maxlen is not None and self._cap >= self._maxlen:
+                slot = self._start
+                self._start = (slot + 1) % self._cap
+                return slot
+            self._grow()
+        self._n = n + 1
+        return n
+
+    def _order(self):
+        """논리 순서(오래된 것 → 최신)의 물리 인덱스 (컬럼 일괄 슬라이싱용)"""
+        if self._start == 0:
+            return slice(0, self._n)
+        return np.r_[self._start:self._cap, 0:self._start]
+
+    @abstractmethod
+    def _row(self, i: int):
+        """물리 인덱스 i 의 이벤트를 소비자용 형태(튜플/dict)로 복원"""
+        pass
+
+    def _at(self, i: int):
+        return self._row((self._start + i) % self._cap if self._start else i)
+
+    def __len__(self):
+        return self._n
+
+    def __bool__(self):
+        return self._n > 0
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self._at(i)
+
+    def __reversed__(self):
+        for i in range(self._n - 1, -1, -1):
+            yield self._at(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._at(i) for i in range(*key.indices(self._n))]
+        if key < 0:
+            key += self._n
+        if not 0 <= key < self._n:
+            raise IndexError("event index out of range")
+        return self._at(key)
+
+    def clear(self):
+        self._n = 0
+        self._start = 0
+
+
+class LogEventBuffer(_ColumnBuffer):
+    """
+    봉 단위 LOG 이벤트: (bar, "LOG", cross, macd, signal, price)
+    """
+
+    _columns = ("bar", "cross", "macd", "signal", "price")
+
+    def _alloc(self, cap: int):
+        self.bar = np.empty(cap, dtype=np.int64)
+        self.cross = np.empty(cap, dtype=np.int8)
+        self.macd = np.empty(cap, dtype=np.float64)
+        self.signal = np.empty(cap, dtype=np.float64)
+        self.price = np.empty(cap, dtype=np.float64)
+
+    def record(self, bar: int, cross: str, macd: float, signal: float, price: float):
+        i = self._next_slot()
+        self.bar[i] = bar
+        self.cross[i] = CROSS_ID[cross]
+        self.macd[i] = macd
+        self.signal[i] = signal
+        self.price[i] = price
+
+    def _row(self, i: int):
+        return (
+            int(self.bar[i]),
+            "LOG",
+            CROSS_TYPES[self.cross[i]],
+            float(self.macd[i]),
+            float(self.signal[i]),
+            float(self.price[i]),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        o = self._order()
+        return pd.DataFrame({
+            "bar": self.bar[o],
+            "type": "LOG",
+            "cross": pd.Categorical.from_codes(self.cross[o], categories=list(CROSS_TYPES)),
+            "macd": self.macd[o],
+            "signal": self.signal[o],
+            "price": self.price[o],
+        })
+
+
+class TradeEventBuffer(_ColumnBuffer):
+    """
+    BUY/SELL 트레이드 이벤트 (기존 15키 dict 와 동일 필드)
+    - reason 문자열은 정수 id 로 인터닝 (TRADE_REASONS 는 고정 id)
+    - 선택 값(entry_price/tp/sl/highest/ts_pct)은 NaN, entry_bar 는 -1 로 None 표현
+    """
+
+    _columns = (
+        "bar", "type_id", "reason_id", "timestamp", "price", "macd", "signal",
+        "entry_price", "entry_bar", "bars_held", "tp", "sl", "highest",
+        "ts_pct", "ts_armed",
+    )
+
+    def __init__(self, capacity: int = 64, maxlen: int | None = None):
+        self._reasons: list[str] = list(TRADE_REASONS)
+        self._reason_id: dict[str, int] = dict(REASON_ID)
+        super().__init__(capacity, maxlen)
+
+    def _alloc(self, cap: int):
+        self.bar = np.empty(cap, dtype=np.int64)
+        self.type_id = np.empty(cap, dtype=np.int8)
+        self.reason_id = np.empty(cap, dtype=np.int32)
+        self.timestamp = np.empty(cap, dtype=object)
+        self.price = np.empty(cap, dtype=np.float64)
+        self.macd = np.empty(cap, dtype=np.float64)
+        self.signal = np.empty(cap, dtype=np.float64)
+        self.entry_price = np.empty(cap, dtype=np.float64)
+        self.entry_bar = np.empty(cap, dtype=np.int64)
+        self.bars_held = np.empty(cap, dtype=np.int64)
+        self.tp = np.empty(cap, dtype=np.float64)
+        self.sl = np.empty(cap, dtype=np.float64)
+        self.highest = np.empty(cap, dtype=np.float64)
+        self.ts_pct = np.empty(cap, dtype=np.float64)
+        self.ts_armed = np.empty(cap, dtype=np.bool_)
+
+    def _intern_reason(self, reason: str) -> int:
+        rid = self._reason_id.get(reason)
+        if rid is None:
+            rid = len(self._reasons)
+            self._reasons.append(reason)
+            self._reason_id[reason] = rid
+        return rid
+
+    def record(
+        self, bar, type, reason, timestamp, price, macd, signal,
+        entry_price, entry_bar, bars_held, tp, sl, highest, ts_pct, ts_armed,
+    ):
+        """필드 순서 = TRADE_FIELDS (핫패스에서는 위치 인자로 호출)"""
+        i = self._next_slot()
+        self.bar[i] = bar
+        self.type_id[i] = TRADE_TYPE_ID[type]
+        self.reason_id[i] = self._intern_reason(reason)
+        self.timestamp[i] = timestamp
+        self.price[i] = price
+        self.macd[i] = macd
+        self.signal[i] = signal
+        self.entry_price[i] = _opt_float(entry_price)
+        self.entry_bar[i] = _NO_BAR if entry_bar is None else entry_bar
+        self.bars_held[i] = bars_held
+        self.tp[i] = _opt_float(tp)
+        self.sl[i] = _opt_float(sl)
+        self.highest[i] = _opt_float(highest)
+        self.ts_pct[i] = _opt_float(ts_pct)
+        self.ts_armed[i] = bool(ts_armed)
+
+    def _row(self, i: int) -> dict:
+        eb = int(self.entry_bar[i])
+        return {
+            "bar": int(self.bar[i]),
+            "type": TRADE_TYPES[self.type_id[i]],
+            "reason": self._reasons[self.reason_id[i]],
+            "timestamp": self.timestamp[i],
+            "price": float(self.price[i]),
+            "macd": float(self.macd[i]),
+            "signal": float(self.signal[i]),
+            "entry_price": _opt_out(self.entry_price[i]),
+            "entry_bar": None if eb == _NO_BAR else eb,
+            "bars_held": int(self.bars_held[i]),
+            "tp": _opt_out(self.tp[i]),
+            "sl": _opt_out(self.sl[i]),
+            "highest": _opt_out(self.highest[i]),
+            "ts_pct": _opt_out(self.ts_pct[i]),
+            "ts_armed": bool(self.ts_armed[i]),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        o = self._order()
+        reasons = np.asarray(self._reasons, dtype=object)
+        entry_bar = self.entry_bar[o].astype(np.float64)
+        entry_bar[self.entry_bar[o] == _NO_BAR] = np.nan
+        return pd.DataFrame({
+            "bar": self.bar[o],
+            "type": np.asarray(TRADE_TYPES, dtype=object)[self.type_id[o]],
+            "reason": reasons[self.reason_id[o]],
+            "timestamp": self.timestamp[o],
+            "price": self.price[o],
+            "macd": self.macd[o],
+            "signal": self.signal[o],
+            "entry_price": self.entry_price[o],
+            "entry_bar": entry_bar,
+            "bars_held": self.bars_held[o],
+            "tp": self.tp[o],
+            "sl": self.sl[o],
+            "highest": self.highest[o],
+            "ts_pct": self.ts_pct[o],
+            "ts_armed": self.ts_armed[o],
+        }, columns=list(TRADE_FIELDS))
@@ -0,0 +1,348 @@
+"""
+MACD 전략 고속 경로 - backtesting.py 루프 없이 단일 커널로 전 구간 실행
+파라미터 그리드 탐색처럼 Backtest.run() 을 반복 호출하는 용도
+
+- 지표(EMA/MACD/Signal/MA)와 매수/매도 상태머신을 한 번의 루프에서 처리
+- numba 설치 시 JIT 컴파일, 미설치 시 같은 코드가 순수 파이썬으로 동작 (utils/jit_util.py)
+- 판정 규칙은 core/strategy_v2.py MACDStrategy 와 동일 (감사/DB/지갑 게이트는 제외)
+- 체결 모델은 Backtest 와 동일: 신호 봉의 다음 봉에서 포지션 반영
+"""
+import numpy as np
+
+from utils.jit_util import njit
+
+
+# 매도 트리거 코드 (strategy_events.TRADE_REASONS 인덱스와 동일)
+SELL_STOP_LOSS = 1
+SELL_TRAILING_STOP = 2
+SELL_TAKE_PROFIT = 3
+SELL_MACD_NEGATIVE = 4
+SELL_SIGNAL_NEGATIVE = 5
+SELL_DEAD_CROSS = 6
+
+# 매수 조건 비트 (strategy_v2._BUY_KEYS 순서) / 매도 조건 비트 (_SELL_KEYS 순서)
+BUY_GOLDEN, BUY_MACD_POS, BUY_SIGNAL_POS, BUY_BULLISH, BUY_TREND_UP, BUY_ABOVE20, BUY_ABOVE60 = (
+    1 << i for i in range(7)
+)
+BUY_SIGNAL_CONFIRM = 1 << 7
+SELL_TS, SELL_TP, SELL_SL, SELL_MACD_NEG, SELL_SIGNAL_NEG, SELL_DEAD = (1 << i for i in range(6))
+
+KIND_BUY = 0
+KIND_SELL = 1
+
+_EPS = 1e-8          # TP/SL/TS 가격 비교 EPS (MACDStrategy._evaluate_sell 과 동일)
+_CROSS_EPS_ABS = 1e-10
+_CROSS_EPS_REL = 1e-6
+
+
+@njit("float64[:](float64[:], int64)", cache=True)
+def ewm_mean(x, span):
+    """
+    pd.Series(x).ewm(span=span, adjust=False).mean() 과 비트 단위 동일한 재귀식
+    (pandas 와 같은 alpha 계산/정규화/NaN 처리 순서)
+    - 시그니처 고정 → 호출마다 타입 추론 없음 (fastmath 는 pandas 와 결과가 달라져 사용 안 함)
+    """
+    n = len(x)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    com = (span - 1) / 2.0
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    old_wt = 1.0
+    weighted = x[0]
+    out[0] = weighted
+    for i in range(1, n):
+        cur = x[i]
+        if weighted == weighted:
+            # 중간 NaN 은 가중치만 감쇠 (pandas ignore_na=False 동작)
+            old_wt *= old_wt_factor
+            if cur == cur:
+                if weighted != cur:
+                    weighted = old_wt * weighted + alpha * cur
+                    weighted /= (old_wt + alpha)
+                old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+@njit("float64[:](float64[:], int64)", cache=True)
+def sma(x, w):
+    """누적합 기반 단순이동평균 (strategy_v2._sma_np 와 동일 결과)"""
+    n = len(x)
+    out = np.full(n, np.nan)
+    if w <= 0 or n < w:
+        return out
+    c = np.empty(n)     # NaN 을 0 으로 본 누적합
+    k = np.empty(n)     # NaN 개수 누적 (창 안에 NaN 있으면 결과 NaN)
+    acc = 0.0
+    cnt = 0.0
+    for i in range(n):
+        v = x[i]
+        if v == v:
+            acc += v
+        else:
+            cnt += 1.0
+        c[i] = acc
+        k[i] = cnt
+    if k[w - 1] == 0.0:
+        out[w - 1] = c[w - 1] / w
+    for i in range(w, n):
+        if k[i] == k[i - w]:
+            out[i] = (c[i] - c[i - w]) / w
+    return out
+
+
+@njit(cache=True)
+def macd_indicators(close, high, low, fast, slow, signal_period, vol_window):
+    """
+    MACD/Signal/MA20/MA60/변동성을 한 번의 루프로 계산 (입력 배열을 각 1회만 읽음)
+    - EMA 는 ewm_mean 과 같은 재귀식, MA 는 sma 와 같은 누적합 차분 → 개별 계산과 비트 단위 동일
+    반환: (macd, signal, ma20, ma60, volatility)
+    """
+    n = len(close)
+    macd = np.empty(n)
+    sig = np.empty(n)
+    ma20 = np.full(n, np.nan)
+    ma60 = np.full(n, np.nan)
+    vol = np.full(n, np.nan)
+    if n == 0:
+        return macd, sig, ma20, ma60, vol
+
+    c_close = np.empty(n)   # 종가 누적합 (NaN 은 0 으로)
+    c_range = np.empty(n)   # (고가-저가) 누적합 (NaN 은 0 으로)
+    k_close = np.empty(n)   # NaN 개수 누적 (창 안에 NaN 있으면 MA 는 NaN)
+    k_range = np.empty(n)
+
+    a_f = 1.0 / (1.0 + (fast - 1) / 2.0)
+    a_s = 1.0 / (1.0 + (slow - 1) / 2.0)
+    a_g = 1.0 / (1.0 + (signal_period - 1) / 2.0)
+    wt_f = wt_s = wt_g = 1.0
+
+    ef = es = close[0]
+    m = ef - es
+    g = m
+    acc_c = acc_r = 0.0
+    nan_c = nan_r = 0.0
+
+    for i in range(n):
+        x = close[i]
+        if i > 0:
+            # EMA 재귀식 (ewm_mean 과 동일: 중간 NaN 은 가중치만 감쇠)
+            if ef == ef:
+                wt_f *= 1.0 - a_f
+                if x == x:
+                    if ef != x:
+                        ef = (wt_f * ef + a_f * x) / (wt_f + a_f)
+                    wt_f = 1.0
+            elif x == x:
+                ef = x
+            if es == es:
+                wt_s *= 1.0 - a_s
+                if x == x:
+                    if es != x:
+                        es = (wt_s * es + a_s * x) / (wt_s + a_s)
+                    wt_s = 1.0
+            elif x == x:
+                es = x
+            m = ef - es
+            if g == g:
+                wt_g *= 1.0 - a_g
+                if m == m:
+                    if g != m:
+                        g = (wt_g * g + a_g * m) / (wt_g + a_g)
+                    wt_g = 1.0
+            elif m == m:
+                g = m
+        macd[i] = m
+        sig[i] = g
+
+        if x == x:
+            acc_c += x
+        else:
+            nan_c += 1.0
+        r = high[i] - low[i]
+        if r == r:
+            acc_r += r
+        else:
+            nan_r += 1.0
+        c_close[i] = acc_c
+        k_close[i] = nan_c
+        c_range[i] = acc_r
+        k_range[i] = nan_r
+
+        if i == 19:
+            if nan_c == 0.0:
+                ma20[i] = acc_c / 20
+        elif i > 19 and nan_c == k_close[i - 20]:
+            ma20[i] = (acc_c - c_close[i - 20]) / 20
+        if i == 59:
+            if nan_c == 0.0:
+                ma60[i] = acc_c / 60
+        elif i > 59 and nan_c == k_close[i - 60]:
+            ma60[i] = (acc_c - c_close[i - 60]) / 60
+        if vol_window > 0:
+            if i == vol_window - 1:
+                if nan_r == 0.0:
+                    vol[i] = acc_r / vol_window
+            elif i >= vol_window and nan_r == k_range[i - vol_window]:
+                vol[i] = (acc_r - c_range[i - vol_window]) / vol_window
+
+    return macd, sig, ma20, ma60, vol
+
+
+@njit(cache=True)
+def cross_flags(delta_prev, delta_now):
+    """strategy_v2._cross_masks 와 동일한 적응형 EPS 판정 (1봉) → (상향, 하향)"""
+    scale = max(abs(delta_prev), abs(delta_now), 1.0)
+    eps = max(_CROSS_EPS_ABS, _CROSS_EPS_REL * scale)
+    return (delta_prev <= eps and delta_now > eps), (delta_prev >= -eps and delta_now < -eps)
+
+
+@njit(cache=True)
+def ts_step(price, tp_price, highest, one_minus_ts, hold_ok):
+    """
+    ARMED 상태 트레일링 스탑 1봉 갱신 (MACDStrategy._evaluate_sell 과 같은 규칙)
+    - 최고가 갱신 → 한계가 = max(TP 가격, 최고가 × (1 - ts_pct))
+    - 최소 보유 기간 충족 + 가격이 한계가 이하이면 청산
+    반환: (청산 여부, 갱신된 최고가, 한계가)
+    """
+    if price > highest:
+        highest = price
+    limit = max(tp_price, highest * one_minus_ts)
+    return hold_ok and price <= limit + _EPS, highest, limit
+
+
+@njit(cache=True, nogil=True)   # run_fast_grid 스레드 병렬 실행용 (GIL 해제)
+def macd_backtest_kernel(
+    open_, close, fast, slow, signal_period, start,
+    take_profit, stop_loss, ts_pct, min_hold, macd_thr,
+    buy_mask, sell_mask, tp_with_ts,
+    out_bar, out_kind, out_code, out_price, out_entry, out_bars_held, out_armed,
+):
+    """
+    반환: 기록된 이벤트 수 k (out_* 배열의 앞 k 개가 유효)
+    - out_kind: KIND_BUY / KIND_SELL
+    - out_code: BUY 는 통과한 조건 비트마스크, SELL 은 SELL_* 트리거 코드
+    """
+    n = len(close)
+    macd = ewm_mean(close, fast) - ewm_mean(close, slow)
+    sig = ewm_mean(macd, signal_period)
+    ma20 = sma(close, 20)
+    ma60 = sma(close, 60)
+    one_minus_ts = 1 - ts_pct
+
+    ts_on = (sell_mask & SELL_TS) != 0
+    tp_on = (sell_mask & SELL_TP) != 0
+    sl_on = (sell_mask & SELL_SL) != 0
+
+    pos = 0  # 0: 미보유, 1: 매수 체결 대기, 2: 보유, 3: 매도 체결 대기
+    entry = 0.0
+    entry_i = -1
+    highest = 0.0
+    armed = False
+    tp_price = 0.0
+    sl_price = 0.0
+    k = 0
+
+    for i in range(start, n):
+        # 직전 봉 주문은 이번 봉 시가에 체결 → 포지션 반영
+        if pos == 1:
+            pos = 2
+        elif pos == 3:
+            pos = 0
+
+        golden = dead = macd_up = macd_down = sig_up = sig_down = False
+        if i >= 1:
+            m0 = macd[i - 1]
+            m1 = macd[i]
+            s0 = sig[i - 1]
+            s1 = sig[i]
+            m_ok = np.isfinite(m0) and np.isfinite(m1)
+            s_ok = np.isfinite(s0) and np.isfinite(s1)
+            if m_ok and s_ok:
+                golden, dead = cross_flags(m0 - s0, m1 - s1)
+            if m_ok:
+                macd_up, macd_down = cross_flags(m0 - macd_thr, m1 - macd_thr)
+            if s_ok:
+                sig_up, sig_down = cross_flags(s0 - macd_thr, s1 - macd_thr)
+
+        price = close[i]
+
+        # --- SELL (보유 중일 때만)
+        if pos == 2:
+            hold_ok = i >= entry_i + min_hold
+            tp_reached = price >= tp_price - _EPS
+            if tp_on and tp_reached and ts_on and not armed:
+                armed = True
+                highest = price
+
+            code = 0
+            if sl_on and price <= sl_price + _EPS:
+                code = SELL_STOP_LOSS
+            else:
+                if ts_on and armed:
+                    ts_hit, highest, _ = ts_step(price, tp_price, highest, one_minus_ts, hold_ok)
+                    if ts_hit:
+                        code = SELL_TRAILING_STOP
+                if code == 0:
+                    if tp_on and tp_reached and (tp_with_ts or not ts_on):
+                        code = SELL_TAKE_PROFIT
+                    elif (sell_mask & SELL_MACD_NEG) != 0 and macd_down:
+                        code = SELL_MACD_NEGATIVE
+                    elif (sell_mask & SELL_SIGNAL_NEG) != 0 and sig_down:
+                        code = SELL_SIGNAL_NEGATIVE
+                    elif (sell_mask & SELL_DEAD) != 0 and dead:
+                        code = SELL_DEAD_CROSS
+
+            if code != 0:
+                out_bar[k] = i
+                out_kind[k] = KIND_SELL
+                out_code[k] = code
+                out_price[k] = price
+                out_entry[k] = entry
+                out_bars_held[k] = i - entry_i
+                out_armed[k] = armed
+                k += 1
+                pos = 3
+                armed = False
+
+        # --- BUY (미보유일 때만)
+        if pos == 0 and buy_mask != 0:
+            passed = 0
+            if golden:
+                passed |= BUY_GOLDEN
+            if macd_up:
+                passed |= BUY_MACD_POS
+            if sig_up:
+                passed |= BUY_SIGNAL_POS | BUY_SIGNAL_CONFIRM
+            o = open_[i]
+            if np.isfinite(price) and np.isfinite(o) and price > o:
+                passed |= BUY_BULLISH
+            if i >= 2 and macd[i - 2] < macd[i - 1] and macd[i - 1] < macd[i]:
+                passed |= BUY_TREND_UP
+            if np.isfinite(price) and np.isfinite(ma20[i]) and price > ma20[i]:
+                passed |= BUY_ABOVE20
+            if np.isfinite(price) and np.isfinite(ma60[i]) and price > ma60[i]:
+                passed |= BUY_ABOVE60
+
+            if (passed & buy_mask) == buy_mask:
+                entry = price
+                entry_i = i
+                highest = price
+                armed = False
+                tp_price = entry * (1 + take_profit)
+                sl_price = entry * (1 - stop_loss)
+                out_bar[k] = i
+                out_kind[k] = KIND_BUY
+                out_code[k] = passed & buy_mask
+                out_price[k] = price
+                out_entry[k] = entry
+                out_bars_held[k] = 0
+                out_armed[k] = False
+                k += 1
+                pos = 1
+
+    return k
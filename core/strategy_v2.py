@@ -1,4 +1,5 @@
 from backtesting import Strategy
+import numpy as np
 import pandas as pd
 import logging
 from config import (
@@ -8,24 +9,45 @@ from config import (
     AUDIT_LOG_SKIP_POS,
     AUDIT_SKIP_POS_SAMPLE_N,
     AUDIT_DEDUP_PER_BAR,
+    LOG_EVENTS_MAX,
+    AUDIT_BATCH_ROWS,
+    CONDITIONS_RELOAD_EVERY_BARS,
     TP_WITH_TS,
     DEFAULT_STRATEGY_TYPE,
 )
+import hashlib
 import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 # Audit
-from services.db import insert_buy_eval, insert_sell_eval, has_open_by_orders
+from services.db import (
+    insert_buy_eval, insert_sell_eval, insert_buy_evals_many, insert_sell_evals_many, has_open_by_orders,
+)
 from services.init_db import get_db_path
 
+from core.strategy_events import LogEventBuffer, TradeEventBuffer, TRADE_REASONS
+from core import strategy_fast
+from utils.jit_util import NUMBA_AVAILABLE
+
 import inspect, os, math
 
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 컨디션 JSON 파싱에 사용
+except ImportError:
+    orjson = None
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(name)s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+
+# 호스트 앱(engine_runner 등)이 이미 로깅을 구성했다면 건드리지 않음
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +81,172 @@ def _make_conditions_path(obj, uid: str) -> Path:
     return Path(f"{uid}_{st}_{CONDITIONS_JSON_FILENAME}")
 
 
+# 매수/매도 Condition 키 (비트마스크 순서 = 튜플 순서)
+_BUY_KEYS = (
+    "golden_cross",
+    "macd_positive",
+    "signal_positive",
+    "bullish_candle",
+    "macd_trending_up",
+    "above_ma20",
+    "above_ma60",
+)
+_SELL_KEYS = (
+    "trailing_stop",
+    "take_profit",
+    "stop_loss",
+    "macd_negative",
+    "signal_negative",
+    "dead_cross",
+)
+
+# SELL 트리거(매도 사유) → 실행 로그
+_SELL_TRIGGER_LOGS = {
+    "Stop Loss": "🛑 SL HIT → SELL",
+    "Trailing Stop": "🛑 TS HIT → SELL",
+    "Take Profit": "💰 TP HIT (TS OFF or TP_WITH_TS=True) → SELL",
+    "MACD Negative": "📉 MACD < threshold → SELL",
+    "Signal Negative": "📉 Signal < threshold → SELL",
+    "Dead Cross": "🛑 Dead Cross → SELL",
+}
+
+# 컨디션 파일이 없을 때의 기본값 (전부 OFF, 읽기 전용 싱글턴 — 매 init 마다 새 dict 생성 안 함)
+_DEFAULT_CONDITIONS = MappingProxyType({
+    "buy": MappingProxyType(dict.fromkeys(_BUY_KEYS, False)),
+    "sell": MappingProxyType(dict.fromkeys(_SELL_KEYS, False)),
+})
+
+
+def _condition_flags(conditions: dict) -> tuple[tuple, tuple]:
+    """Condition dict → (_BUY_KEYS 순서 bool 튜플, _SELL_KEYS 순서 bool 튜플)"""
+    buy = conditions.get("buy") or {}
+    sell = conditions.get("sell") or {}
+    return (
+        tuple(bool(buy.get(k, False)) for k in _BUY_KEYS),
+        tuple(bool(sell.get(k, False)) for k in _SELL_KEYS),
+    )
+
+
+def _flags_to_mask(flags) -> int:
+    return sum(1 << i for i, on in enumerate(flags) if on)
+
+
+# BUY 사유 문자열 캐시: 통과 조건 비트마스크 → "golden_cross+above_ma20" (최대 2^8 종)
+_BUY_REASON_CACHE: dict[int, str] = {}
+
+
+def _buy_reason(mask: int) -> str:
+    reason = _BUY_REASON_CACHE.get(mask)
+    if reason is None:
+        keys = [k for i, k in enumerate(_BUY_KEYS) if mask & (1 << i)]
+        if mask & strategy_fast.BUY_SIGNAL_CONFIRM:
+            keys.append("signal_confirm")
+        reason = "+".join(keys) if keys else "BUY"
+        _BUY_REASON_CACHE[mask] = reason
+    return reason
+
+
+def _cross_masks(x, y, eps_abs: float = 1e-10, eps_rel: float = 1e-6):
+    """
+    x 가 y(배열 또는 스칼라)를 상향/하향 돌파한 봉 마스크.
+    적응형 EPS: eps = max(eps_abs, eps_rel × max(|직전 델타|, |현재 델타|, 1)) 를 전 구간에 한 번에 적용한다.
+    (MACDStrategy 의 골든/데드·임계값 돌파 판정은 모두 이 마스크를 사용)
+    - 직전/현재 봉 값이 모두 유한할 때만 True
+    반환: (up, down) bool 배열 (길이 = len(x), 0번 봉은 항상 False)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.broadcast_to(np.asarray(y, dtype=np.float64), x.shape)
+    up = np.zeros(len(x), dtype=bool)
+    down = np.zeros(len(x), dtype=bool)
+    if len(x) < 2:
+        return up, down
+
+    finite = np.isfinite(x) & np.isfinite(y)
+    delta = x - y
+    dp, dn = delta[:-1], delta[1:]
+    with np.errstate(invalid="ignore"):
+        scale = np.maximum(np.maximum(np.abs(dp), np.abs(dn)), 1.0)
+        eps = np.maximum(eps_abs, eps_rel * scale)
+        ok = finite[:-1] & finite[1:]
+        up[1:] = ok & (dp <= eps) & (dn > eps)
+        down[1:] = ok & (dp >= -eps) & (dn < -eps)
+    return up, down
+
+
+# 봉 단위 상태 스냅샷 (next()에서 1회 생성 후 하위 평가 함수에 전달)
+_BarState = namedtuple("_BarState", "bar price macd signal volatility timestamp")
+
+_KST = ZoneInfo("Asia/Seoul")
+
+
+def _kst_index(index):
+    """
+    감사로그 bar_time 용 KST 시각 인덱스 (시각 인덱스가 아니면 None)
+    - tz 없는 인덱스는 data_feed 규약(KST 변환 후 tz 제거)대로 KST 로 간주
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        return None
+    return index.tz_localize(_KST) if index.tz is None else index.tz_convert(_KST)
+
+
+def _ewm_span(x, span: int):
+    """
+    EMA(adjust=False) - pd.Series(x).ewm(span=span, adjust=False).mean() 과 동일 결과
+    - numba 설치 시 JIT 재귀식(strategy_fast.ewm_mean), 미설치 시 pandas ewm
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return strategy_fast.ewm_mean(x, int(span))
+    return pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def _sma_np(x, w: int):
+    """
+    누적합(cumsum) 기반 단순이동평균.
+    - pd.Series(x).rolling(w).mean().values 와 동일한 모양(앞쪽 w-1개는 NaN)
+    - Series 생성/rolling 객체 없이 한 번의 패스로 계산
+    """
+    x = np.asarray(x, dtype=np.float64)
+    nan = np.isnan(x)
+    c = np.cumsum(np.where(nan, 0.0, x))
+    out = np.full_like(c, np.nan)
+    if w <= 0 or len(c) < w:
+        return out
+    out[w - 1] = c[w - 1] / w
+    out[w:] = (c[w:] - c[:-w]) / w
+    # 창 안에 NaN 이 있으면 NaN (rolling 과 동일, 이후 창에는 번지지 않음)
+    if nan.any():
+        k = np.cumsum(nan)
+        k_win = k[w - 1:] - np.concatenate(([0], k[:-w]))
+        out[w - 1:][k_win > 0] = np.nan
+    return out
+
+
+def _macd_indicators(close, high, low, fast: int, slow: int, signal_period: int, vol_window: int):
+    """
+    MACDStrategy 지표 일괄 계산 → (macd, signal, ma20, ma60, volatility)
+    - numba 설치 시 strategy_fast.macd_indicators 단일 패스 커널
+    - 미설치 시 _ewm_span/_sma_np 개별 계산 (결과 동일)
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return strategy_fast.macd_indicators(
+            close, high, low, int(fast), int(slow), int(signal_period), int(vol_window)
+        )
+    # 종가 Series 는 1회만 생성해서 fast/slow EMA 에 공유
+    s = pd.Series(close)
+    macd = (s.ewm(span=fast, adjust=False).mean() - s.ewm(span=slow, adjust=False).mean()).to_numpy()
+    return (
+        macd,
+        _ewm_span(macd, signal_period),
+        _sma_np(close, 20),
+        _sma_np(close, 60),
+        _sma_np(np.subtract(high, low), vol_window),
+    )
+
+
 # ============================================================
 # MACD Strategy
 # ============================================================
@@ -79,6 +267,17 @@ class MACDStrategy(Strategy):
     _seen_buy_audits = set()
     _seen_sell_audits = set()
 
+    # 컨디션 파일 캐시: (절대경로, st_mtime_ns) → dict  (그리드 서치 등 반복 init 시 재파싱 방지)
+    _conditions_cache = {}
+    _CONDITIONS_CACHE_MAX = 64
+
+    # 엔트리 기준 캐시 (entry_price/entry_bar 세터가 갱신 → 어떤 경로로 엔트리가 바뀌어도 동기화)
+    _entry_price = None
+    _entry_bar = None
+    _tp_price = None
+    _sl_price = None
+    _min_sell_bar = None   # entry_bar + min_holding_period (보유 기간 게이트)
+
     # =========================
     # 업비트 티커 정규화 유틸 추가
     #  - "KRW-WLFI" → "WLFI" 로 변환하여 월렛 조회 훅에 전달
@@ -91,23 +290,99 @@ class MACDStrategy(Strategy):
         except Exception:
             return ticker
 
+    @property
+    def entry_price(self):
+        return self._entry_price
+
+    @entry_price.setter
+    def entry_price(self, value):
+        """엔트리 가격 설정 시 TP/SL 가격을 1회 계산 (매 봉 재계산 방지)"""
+        self._entry_price = value
+        if value is None:
+            self._tp_price = None
+            self._sl_price = None
+        else:
+            self._tp_price = value * (1 + self.take_profit)
+            self._sl_price = value * (1 - self.stop_loss)
+
+    @property
+    def entry_bar(self):
+        return self._entry_bar
+
+    @entry_bar.setter
+    def entry_bar(self, value):
+        """엔트리 봉 설정 시 SELL(TS) 허용 시작 봉 = entry_bar + min_holding_period 갱신"""
+        self._entry_bar = value
+        self._min_sell_bar = None if value is None else value + self.min_holding_period
+
     def init(self):
         logger.info("MACDStrategy init")
+        # 핫패스 INFO 로그 게이트 (INFO 비활성 시 포맷팅 자체를 건너뜀)
+        self._log_info = logger.isEnabledFor(logging.INFO)
+        self._log_debug = logger.isEnabledFor(logging.DEBUG)
+        self._has_wallet_hook = callable(getattr(self, "has_wallet_position", None))
+        # 선택 파라미터는 1회만 해석 (매 봉 getattr 기본값 조회 제거)
+        self._ticker = getattr(self, "ticker", "UNKNOWN")
+        self._interval_sec = getattr(self, "interval_sec", 60)
+        self._uid = getattr(self, "user_id", "UNKNOWN")
+        self._wallet_ticker = self._norm_ticker(self._ticker)   # 월렛 훅용 ("KRW-WLFI" → "WLFI")
         logger.info(f"[BOOT] strategy_file={os.path.abspath(inspect.getfile(self.__class__))}")
         logger.info(f"[BOOT] __name__={__name__} __package__={__package__}")
 
         close = self.data.Close
-        self.macd_line = self.I(
-            self._calculate_macd, close, self.fast_period, self.slow_period
-        )
-        self.signal_line = self.I(
-            self._calculate_signal, self.macd_line, self.signal_period
-        )
-        self.ma20 = self.I(lambda x: pd.Series(x).rolling(20).mean().values, close)
-        self.ma60 = self.I(lambda x: pd.Series(x).rolling(60).mean().values, close)
-        self.volatility = self.I(
-            self._calculate_volatility, self.data.High, self.data.Low
+        # 지표는 한 번에 계산 후 self.I 로 등록 (numba 설치 시 단일 패스 커널)
+        macd, signal, ma20, ma60, volatility = _macd_indicators(
+            close, self.data.High, self.data.Low,
+            self.fast_period, self.slow_period, self.signal_period, self.volatility_window,
         )
+        self.macd_line = self.I(lambda: macd, name="MACD")
+        self.signal_line = self.I(lambda: signal, name="Signal")
+        self.ma20 = self.I(lambda: ma20, name="MA20")
+        self.ma60 = self.I(lambda: ma60, name="MA60")
+        # 변동성은 매수/매도 판정에 쓰이지 않는 표시/상태용 → float32 로 보관 (메모리 절반)
+        #  - MACD/Signal/MA 는 크로스 EPS·가격 비교에 쓰이므로 float64 유지
+        volatility = volatility.astype(np.float32)
+        self.volatility = self.I(lambda: volatility, name="Volatility")
+
+        # ✅ 원본 ndarray 참조 (전 구간) → 봉 조회는 self._bar_idx 로 직접 인덱싱
+        #    self.data.Close[-1] / self.macd_line[-1] 같은 _Array 속성 체인을 매 봉 타지 않도록
+        self._close_arr = close_arr = np.asarray(close, dtype=np.float64)
+        self._open_arr = open_arr = np.asarray(self.data.Open, dtype=np.float64)
+        self._macd_arr = macd_arr = np.asarray(self.macd_line, dtype=np.float64)
+        self._signal_arr = np.asarray(self.signal_line, dtype=np.float64)
+        self._vol_arr = np.asarray(self.volatility)
+        self._ma20_arr = ma20_arr = np.asarray(self.ma20, dtype=np.float64)
+        self._ma60_arr = ma60_arr = np.asarray(self.ma60, dtype=np.float64)
+        self._index = self.data.index
+        self._kst_index = _kst_index(self._index)
+        # 봉 상태/BUY 리포트용 값은 파이썬 float 튜플로 1회 변환
+        #  → 매 봉 numpy 스칼라 생성 + float() 변환 없이 인덱스 1회로 언패킹
+        self._state_vals = list(zip(
+            close_arr.tolist(), macd_arr.tolist(), self._signal_arr.tolist(), self._vol_arr.tolist(),
+        ))
+        self._report_vals = list(zip(open_arr.tolist(), ma20_arr.tolist(), ma60_arr.tolist()))
+
+        # ✅ 봉별 판정 플래그를 전 구간 벡터로 1회 계산 → next()에서는 인덱스 조회만
+        #    (self.I 로 등록하지 않음: 지표 슬라이싱/플롯 대상이 아니므로 일반 ndarray 로 보관)
+        close_ok = np.isfinite(close_arr)
+
+        self._golden, self._dead = _cross_masks(macd_arr, self._signal_arr)
+        self._bullish = close_ok & np.isfinite(open_arr) & (close_arr > open_arr)
+        self._trend_up = np.zeros(len(macd_arr), dtype=bool)
+        self._trend_up[2:] = (macd_arr[:-2] < macd_arr[1:-1]) & (macd_arr[1:-1] < macd_arr[2:])
+        self._above20 = close_ok & np.isfinite(ma20_arr) & (close_arr > ma20_arr)
+        self._above60 = close_ok & np.isfinite(ma60_arr) & (close_arr > ma60_arr)
+        # macd_threshold 상향/하향 돌파 (BUY macd/signal_positive·signal_confirm, SELL macd/signal_negative)
+        self._macd_up, self._macd_down = _cross_masks(macd_arr, self.macd_threshold)
+        self._signal_up, self._signal_down = _cross_masks(self._signal_arr, self.macd_threshold)
+        self._bar_idx = len(self.data) - 1
+
+        # BUY 체크 테이블 (_BUY_KEYS 순서의 (이름, 봉별 판정 배열))
+        #  - golden_cross: 크로스 상태 갱신 후 'Golden' 인 봉 = 이번 봉 골든크로스
+        self._buy_check_arrays = tuple(zip(_BUY_KEYS, (
+            self._golden, self._macd_up, self._signal_up, self._bullish,
+            self._trend_up, self._above20, self._above60,
+        )))
 
         self.entry_price = None
         self.entry_bar = None
@@ -116,7 +391,12 @@ class MACDStrategy(Strategy):
         self.golden_cross_pending = False
         self.trailing_stop_pct = TRAILING_STOP_PERCENT
         self.last_cross_type = None
-        self._last_sell_bar = None
+        self.bars_since_cross = 1_000_000   # 첫 크로스 전까지 '아주 오래 전'으로 취급
+
+        self._one_minus_ts = 1 - self.trailing_stop_pct
+        # 동일 봉 중복 BUY/SELL 방지용 (봉 번호는 0 이상 → -1 은 '없음')
+        self._last_buy_bar = -1
+        self._last_sell_bar = -1
 
         # 🔥 FIX: bars_held 버그 수정 - DataFrame 길이 대신 누적 카운터 사용
         self._bar_counter = len(self.data) - 1  # 초기 데이터 기준으로 시작
@@ -130,36 +410,56 @@ class MACDStrategy(Strategy):
         self._sell_sample_n = 60
         self._last_buy_sig = None      # BUY 상태 시그니처(변화 감지용)
         self._buy_sample_n = 60        # 샘플링 주기(원하면 0/None으로 끔)
-
-        MACDStrategy.log_events = []
-        MACDStrategy.trade_events = []
+        # 감사 행 버퍼: (dedup 키, insert_*_eval 인자) → AUDIT_BATCH_ROWS 마다/마지막 봉에서 일괄 적재
+        self._buy_audit_rows = []
+        self._sell_audit_rows = []
+        self._guard_broker_stop()
+
+        # 이벤트는 컬럼형 버퍼에 적재 (튜플/dict 시퀀스 뷰는 그대로 지원)
+        #  - LOG: 봉당 1건 → 데이터 길이만큼 미리 확보 (LOG_EVENTS_MAX 초과분은 링 버퍼로 덮어씀)
+        #  - 트레이드: 최소 보유 기간 기준 추정치로 확보 (초과 시 버퍼가 2배 확장)
+        n_bars = len(self.data)
+        self._last_idx = n_bars - 1
+        #  - 버퍼는 인스턴스 소유 (병렬 백테스트끼리 공유 금지) → 실행 후 stats._strategy.log_events 로 조회
+        self.log_events = LogEventBuffer(n_bars, maxlen=LOG_EVENTS_MAX)
+        self.trade_events = TradeEventBuffer(
+            min(n_bars, n_bars // max(int(self.min_holding_period or 0), 1)) + 8
+        )
+        # 하위호환 미러: engine/live_loop_old.py 는 실행 후 events_cls.log_events / trade_events 를 읽음
+        #  (마지막으로 init 된 실행의 버퍼만 가리킴 → 병렬 실행에서는 인스턴스 버퍼를 쓸 것)
+        MACDStrategy.log_events = self.log_events
+        MACDStrategy.trade_events = self.trade_events
 
         # ✅ 전략 타입까지 반영된 컨디션 파일 경로
-        uid = getattr(self, 'user_id', 'UNKNOWN')
-        self._cond_path = _make_conditions_path(self, uid)
+        self._cond_path = _make_conditions_path(self, self._uid)
         self._cond_mtime = self._cond_path.stat().st_mtime if self._cond_path.exists() else None
+        self._reload_every = max(int(CONDITIONS_RELOAD_EVERY_BARS or 1), 1)
 
         self.conditions = self._load_conditions()
+        self._compile_conditions()
         self._log_conditions()
 
         # ✅ settings_snapshot은 이제 next()에서 매 봉마다 기록됨 (중복 방지 포함)
 
         try:
-            _uid = getattr(self, "user_id", None)
-            _dbp = get_db_path(_uid if _uid else "UNKNOWN")
+            _dbp = get_db_path(self._uid or "UNKNOWN")
             p = Path(_dbp)
-            logger.info(f"[AUDIT-PATH] user_id={_uid} → db={_dbp} (exists={p.exists()} size={p.stat().st_size if p.exists() else 'NA'})")
+            logger.info(f"[AUDIT-PATH] user_id={self._uid} → db={_dbp} (exists={p.exists()} size={p.stat().st_size if p.exists() else 'NA'})")
         except Exception as e:
             logger.warning(f"[AUDIT-PATH] failed to resolve db path: {e}")
 
     def _maybe_reload_conditions(self):
+        # 파일 stat 은 N 봉마다 + 마지막 봉(라이브 루프의 실시간 봉)에서만
+        i = self._bar_idx
+        if i % self._reload_every and i != self._last_idx:
+            return
         try:
             if self._cond_path and self._cond_path.exists():
                 mtime = self._cond_path.stat().st_mtime
                 if self._cond_mtime != mtime:
-                    with self._cond_path.open("r", encoding="utf-8") as f:
-                        self.conditions = json.load(f)
+                    self.conditions = self._read_conditions(self._cond_path)
                     self._cond_mtime = mtime
+                    self._compile_conditions()
                     logger.info(f"🔄 Condition reloaded: {self._cond_path}")
                     self._log_conditions()
         except Exception as e:
@@ -169,40 +469,53 @@ class MACDStrategy(Strategy):
     # --- Helper Methods
     # -------------------
     def _load_conditions(self):
-        uid = getattr(self, 'user_id', 'UNKNOWN')
-        path = _make_conditions_path(self, uid)
+        path = self._cond_path   # init()에서 _uid 기준으로 1회 계산한 경로
         if path.exists():
-            with path.open("r", encoding="utf-8") as f:
-                conditions = json.load(f)
-                logger.info(f"📂 Condition 파일 로드 완료: {path}")
-                return conditions
+            conditions = self._read_conditions(path)
+            logger.info(f"📂 Condition 파일 로드 완료: {path}")
+            return conditions
         else:
             logger.warning(f"⚠️ Condition 파일 없음. 기본값 사용: {path}")
-            return {
-                "buy": dict.fromkeys(
-                    [
-                        "golden_cross",
-                        "macd_positive",
-                        "signal_positive",
-                        "bullish_candle",
-                        "macd_trending_up",
-                        "above_ma20",
-                        "above_ma60",
-                    ],
-                    False,
-                ),
-                "sell": dict.fromkeys(
-                    [
-                        "trailing_stop",
-                        "take_profit",
-                        "stop_loss",
-                        "macd_negative",
-                        "signal_negative",
-                        "dead_cross"
-                    ],
-                    False,
-                ),
-            }
+            return _DEFAULT_CONDITIONS
+
+    def _compile_conditions(self):
+        """
+        Condition dict → 인스턴스 플래그/비트마스크.
+        매 봉 dict.get 대신 속성 1회 조회로 판정 (로드/핫리로드 시에만 재계산)
+        """
+        buy_flags, sell_flags = _condition_flags(self.conditions)
+
+        (self._c_golden, self._c_macd_pos, self._c_signal_pos, self._c_bullish,
+         self._c_trend_up, self._c_above20, self._c_above60) = buy_flags
+        (self._c_ts, self._c_tp, self._c_sl,
+         self._c_macd_neg, self._c_signal_neg, self._c_dead) = sell_flags
+
+        self._buy_mask = _flags_to_mask(buy_flags)
+        self._sell_mask = _flags_to_mask(sell_flags)
+        # signal_confirm 게이트까지 포함한 BUY 활성 마스크 (매수 시 통과 마스크와 동일)
+        self._buy_enabled_mask = self._buy_mask | (
+            strategy_fast.BUY_SIGNAL_CONFIRM if self.signal_confirm_enabled else 0
+        )
+
+    @classmethod
+    def _read_conditions(cls, path: Path) -> dict:
+        """
+        컨디션 JSON 읽기 (클래스 캐시 경유).
+        - 키: (절대경로, st_mtime_ns) → 파일이 바뀌면 자동으로 새로 읽음
+        - 전략은 conditions 를 수정하지 않으므로 캐시된 dict 를 그대로 공유
+        """
+        key = (os.path.abspath(path), path.stat().st_mtime_ns)
+        cached = cls._conditions_cache.get(key)
+        if cached is not None:
+            return cached
+
+        raw = path.read_bytes()
+        conditions = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+        if len(cls._conditions_cache) >= cls._CONDITIONS_CACHE_MAX:
+            cls._conditions_cache.clear()
+        cls._conditions_cache[key] = conditions
+        return conditions
 
     def _log_conditions(self):
         logger.info("📋 매수/매도 전략 Condition 상태:")
@@ -211,256 +524,143 @@ class MACDStrategy(Strategy):
                 status = "✅ ON" if value else "❌ OFF"
                 logger.info(f" - {key}.{cond}: {status}")
 
-    def _calculate_macd(self, series, fast, slow):
-        return (
-            pd.Series(series).ewm(span=fast, adjust=False).mean()
-            - pd.Series(series).ewm(span=slow, adjust=False).mean()
-        ).values
-
-    def _calculate_signal(self, macd, period):
-        return pd.Series(macd).ewm(span=period, adjust=False).mean().values
-
-    def _calculate_volatility(self, high, low):
-        return pd.Series(high - low).rolling(self.volatility_window).mean().values
-
     def _current_state(self):
         # 🔥 FIX: bars_held 버그 수정 - DataFrame 길이 대신 누적 카운터 사용
         # 기존: idx = len(self.data) - 1 → DataFrame truncate 시 bar 번호 순환
         # 수정: self._bar_counter 사용 → 누적 증가로 정확한 bars_held 계산
-        return {
-            "bar": self._bar_counter,
-            "price": float(self.data.Close[-1]),
-            "macd": float(self.macd_line[-1]),
-            "signal": float(self.signal_line[-1]),
-            "volatility": float(self.volatility[-1]),
-            "timestamp": self.data.index[-1],
-        }
-
-    # -------------------
-    # --- Cross Detection
-    # -------------------
-    @staticmethod
-    def _is_finite(x):
-        try:
-            return math.isfinite(float(x))
-        except Exception:
-            return False
-    
-    @staticmethod
-    def _cross_delta(delta_prev: float, delta_now: float, *, eps_abs: float, eps_rel: float = 0.0) -> tuple[bool, bool]:
-        """
-        반환: (is_golden, is_dead)
-        - eps_abs: 절대 EPS
-        - eps_rel: 상대 EPS (스케일 보정용: 기준은 max(|delta_prev|, |delta_now|))
-        """
-        scale = max(abs(delta_prev), abs(delta_now), 1.0)
-        eps = max(eps_abs, eps_rel * scale) # 적응형 EPS
-        is_golden = (delta_prev <= +eps) and (delta_now > +eps)
-        is_dead = (delta_prev >= -eps) and (delta_now < -eps)
-        return is_golden, is_dead
-
-    def _is_golden_cross(self):
-        # --- 안정성 가드 ---
-        if len(self.macd_line) < 2 or len(self.signal_line) < 2:
-            return False
-        macd_prev, sig_prev = self.macd_line[-2], self.signal_line[-2]
-        macd_now, sig_now = self.macd_line[-1], self.signal_line[-1]
-        if not (self._is_finite(macd_prev) and self._is_finite(sig_prev) and self._is_finite(macd_now) and self._is_finite(sig_now)):
-            return False
-
-        # --- Δ 기반 판단 + 적응형 EPS ---
-        delta_prev = macd_prev - sig_prev
-        delta_now = macd_now - sig_now
-        is_golden, _ = self._cross_delta(delta_prev, delta_now, eps_abs=1e-10, eps_rel=1e-6)
-
-        if not is_golden:
-            return False
-        
-        # --- 의미 필터 ---
-        # 최소 분리도(교차 후 충분히 떨어졌는가)
-        sep_min_abs = 0.0
-        sep_min_rel = 0.0
-        if abs(delta_now) < max(sep_min_abs, sep_min_rel * max(abs(delta_prev), 1.0)):
-            return False
-        
-        # 최소 기울기(변화량이 충분한가)
-        slope_min = 0.0
-        if abs(delta_now - delta_prev) < slope_min:
-            return False
-        
-        # 디바운스: 마지막 교차로부터 N봉 이상
-        N = 0
-        if getattr(self, "bars_since_cross", None) is not None and self.bars_since_cross < N:
-            return False
-        
-        return True
-
-    def _is_dead_cross(self):
-        # --- 안정성 가드 ---
-        if len(self.macd_line) < 2 or len(self.signal_line) < 2:
-            return False
-        macd_prev, sig_prev = self.macd_line[-2], self.signal_line[-2]
-        macd_now,  sig_now  = self.macd_line[-1],  self.signal_line[-1]
-        if not (self._is_finite(macd_prev) and self._is_finite(sig_prev) and self._is_finite(macd_now) and self._is_finite(sig_now)):
-            return False
-
-        # --- Δ 기반 판단 + 적응형 EPS ---
-        delta_prev = macd_prev - sig_prev
-        delta_now = macd_now - sig_now
-        _, is_dead = self._cross_delta(delta_prev, delta_now, eps_abs=1e-10, eps_rel=1e-6)
-
-        # --- 의미 필터 ---
-        # 최소 분리도(교차 후 충분히 떨어졌는가)
-        sep_min_abs = 0.0
-        sep_min_rel = 0.0
-        if abs(delta_now) < max(sep_min_abs, sep_min_rel * max(abs(delta_prev), 1.0)):
-            return False
-        
-        # 최소 기울기(변화량이 충분한가)
-        slope_min = 0.0
-        if abs(delta_now - delta_prev) < slope_min:
-            return False
-        
-        # 디바운스: 마지막 교차로부터 N봉 이상
-        N = 0
-        if getattr(self, "bars_since_cross", None) is not None and self.bars_since_cross < N:
-            return False
-        
-        return is_dead
-
-    # -------------------
-    # --- Candle & Trend
-    # -------------------
-    def _is_bullish_candle(self):
-        return (self._is_finite(self.data.Close[-1]) and self._is_finite(self.data.Open[-1])
-                and self.data.Close[-1] > self.data.Open[-1])
-
-    def _is_macd_trending_up(self):
-        if len(self.macd_line) < 3:
-            return False
-        a, b, c = self.macd_line[-3], self.macd_line[-2], self.macd_line[-1]
-        if pd.isna(a) or pd.isna(b) or pd.isna(c):
-            return False
-        return a < b < c
-
-    def _is_above_ma20(self):
-        return (self._is_finite(self.data.Close[-1]) and self._is_finite(self.ma20[-1])
-                and self.data.Close[-1] > self.ma20[-1])
-
-    def _is_above_ma60(self):
-        return (self._is_finite(self.data.Close[-1]) and self._is_finite(self.ma60[-1])
-                and self.data.Close[-1] > self.ma60[-1])
-
-    def _check_macd_pos(self, state, eps=1e-8) -> bool:
-        return state["macd"] >= (self.macd_threshold - eps)
-
-    def _is_macd_cross_up(self, thr: float, eps_abs: float = 1e-10, eps_rel: float = 1e-6) -> bool:
-        """
-        MACD가 thr(=self.macd_threshold)을 '아래→위'로 돌파했는지 감지.
-        내부의 _cross_delta를 재사용하여 노이즈에 강하게 판정.
-        """
-        if len(self.macd_line) < 2:
-            return False
-        macd_prev = self.macd_line[-2]
-        macd_now  = self.macd_line[-1]
-        if not (self._is_finite(macd_prev) and self._is_finite(macd_now)):
-            return False
-
-        # thr에 대한 상대 위치를 델타로 보고 상향 크로스만 True
-        delta_prev = macd_prev - thr
-        delta_now  = macd_now  - thr
-        is_up, _ = self._cross_delta(delta_prev, delta_now, eps_abs=eps_abs, eps_rel=eps_rel)
-        return is_up
-
-    def _is_macd_cross_down(self, thr: float, eps_abs: float = 1e-10, eps_rel: float = 1e-6) -> bool:
-        if len(self.macd_line) < 2:
-            return False
-        macd_prev = self.macd_line[-2]
-        macd_now  = self.macd_line[-1]
-        if not (self._is_finite(macd_prev) and self._is_finite(macd_now)):
-            return False
-        delta_prev = macd_prev - thr
-        delta_now  = macd_now  - thr
-        _, is_down = self._cross_delta(delta_prev, delta_now, eps_abs=eps_abs, eps_rel=eps_rel)
-        return is_down
-
-    def _check_signal_pos(self, state, eps=1e-8) -> bool:
-        return state["signal"] >= (self.macd_threshold - eps)
-    
-    def _is_signal_cross_up(self, thr: float, eps_abs: float = 1e-10, eps_rel: float = 1e-6) -> bool:
-        """
-        Signal 라인이 thr(=self.macd_threshold)을 '아래→위'로 돌파했는지 감지.
-        _cross_delta 재사용으로 노이즈 억제.
-        """
-        if len(self.signal_line) < 2:
-            return False
-        sig_prev = self.signal_line[-2]
-        sig_now  = self.signal_line[-1]
-        if not (self._is_finite(sig_prev) and self._is_finite(sig_now)):
-            return False
-
-        delta_prev = sig_prev - thr
-        delta_now  = sig_now  - thr
-        is_up, _ = self._cross_delta(delta_prev, delta_now, eps_abs=eps_abs, eps_rel=eps_rel)
-        return is_up
-
-    def _is_signal_cross_down(self, thr: float, eps_abs: float = 1e-10, eps_rel: float = 1e-6) -> bool:
-        """
-        Signal 라인이 thr(=self.macd_threshold)을 '위→아래'로 돌파했는지 감지.
-        _cross_delta 재사용으로 노이즈 억제.
-        """
-        if len(self.signal_line) < 2:
-            return False
-        sig_prev = self.signal_line[-2]
-        sig_now  = self.signal_line[-1]
-        if not (self._is_finite(sig_prev) and self._is_finite(sig_now)):
-            return False
-
-        delta_prev = sig_prev - thr
-        delta_now  = sig_now  - thr
-        _, is_down = self._cross_delta(delta_prev, delta_now, eps_abs=eps_abs, eps_rel=eps_rel)
-        return is_down
+        idx = self._bar_idx
+        price, macd, signal, volatility = self._state_vals[idx]
+        return _BarState(self._bar_counter, price, macd, signal, volatility, self._index[idx])
 
     def _reconcile_entry_with_wallet(self):
         """지갑/포지션과 불일치할 때 고아 엔트리를 정리한다(선택적)."""
         try:
-            sz = getattr(getattr(self, "position", None), "size", 0) or 0
-            if sz == 0 and self.entry_price is not None:
+            if self.entry_price is not None and self.position.size == 0:
                 has_wallet_pos = None
-                if hasattr(self, "has_wallet_position") and callable(self.has_wallet_position):
+                if self._has_wallet_hook:
                     # 월렛 훅 호출 시 티커 정규화
-                    has_wallet_pos = bool(self.has_wallet_position(self._norm_ticker(self.ticker)))
+                    has_wallet_pos = bool(self.has_wallet_position(self._wallet_ticker))
                 if has_wallet_pos is None or has_wallet_pos is False:
                     logger.warning("🧹 고아 엔트리 정리: 포지션/지갑에 보유 없음 → entry 리셋")
                     self._reset_entry()
         except Exception as e:
-            logger.debug(f"[reconcile] skip ({e})")
+            logger.debug("[reconcile] skip (%s)", e)
 
     # -------------------
     # --- Buy/Sell Logic
     # -------------------
     def next(self):
+        try:
+            self._next_bar()
+        except BaseException:
+            # 예외로 실행이 끝나도 버퍼에 남은 감사 행은 적재 (봉마다 적재하던 때와 같은 보존 범위)
+            self._flush_audits()
+            raise
+        # 마지막 봉: 남은 감사 행 일괄 적재
+        if self._bar_idx == self._last_idx:
+            self._flush_audits()
+
+    def _next_bar(self):
         # 🔥 FIX: bars_held 버그 수정 - 매 봉마다 카운터 증가
         self._bar_counter += 1
 
         # ✅ 설정 스냅샷은 live_loop.py에서 1분마다 독립적으로 기록됨 (봉과 무관)
 
-        self.bars_since_cross = getattr(self, "bars_since_cross", 1_000_000) + 1
+        self.bars_since_cross += 1
+        self._bar_idx = len(self.data) - 1
 
         self._reconcile_entry_with_wallet()
         self._maybe_reload_conditions()
-        self._update_cross_state()
-        self._evaluate_sell()
-        self._evaluate_buy()
 
-    def _update_cross_state(self):
+        # ✅ 봉 상태는 1회만 만들고 하위 평가에서 재사용
         state = self._current_state()
-        if self._is_golden_cross():
+        self._update_cross_state(state)
+        # 엔진 포지션도 없고 월렛 훅도 없으면 SELL 평가 진입 자체를 생략
+        in_position = self.position.size > 0
+        if self._has_wallet_hook or in_position:
+            self._evaluate_sell(state)
+        # 엔진 보유 중 BUY 평가는 '보유 차단' 감사 적재 외엔 하는 일이 없음
+        # → 감사 옵션이 꺼져 있으면 게이트 조회 포함 호출 자체를 생략
+        if not (in_position and not AUDIT_LOG_SKIP_POS):
+            self._evaluate_buy(state)
+
+    # =========================
+    # 감사 로그 일괄 적재
+    #  - 봉마다 DB 연결/커밋하던 insert_*_eval 대신 행을 모아 insert_*_evals_many 로 한 번에 기록
+    #  - 적재 시점: AUDIT_BATCH_ROWS 도달 / SELL 트리거 발생 / 마지막 봉
+    #              / next() 예외 / 자금 소진(_OutOfMoneyError)으로 루프 중단
+    #  - 프로세스 내 dedup 세트(_seen_*)는 적재 성공한 행만 반영 (기존 단건 적재와 동일)
+    # =========================
+    def _queue_buy_audit(self, key, row):
+        self._buy_audit_rows.append((key, row))
+        if len(self._buy_audit_rows) >= AUDIT_BATCH_ROWS:
+            self._flush_buy_audits()
+
+    def _queue_sell_audit(self, key, row, flush=False):
+        self._sell_audit_rows.append((key, row))
+        if flush or len(self._sell_audit_rows) >= AUDIT_BATCH_ROWS:
+            self._flush_sell_audits()
+
+    def _flush_buy_audits(self):
+        pending, self._buy_audit_rows = self._buy_audit_rows, []
+        if not pending:
+            return
+        try:
+            insert_buy_evals_many(self._uid, [row for _, row in pending])
+        except Exception as e:
+            logger.error("[AUDIT-BUY] insert failed: %s | rows=%d last_bar=%s", e, len(pending), pending[-1][1]["bar"])
+            return
+        MACDStrategy._seen_buy_audits.update(key for key, _ in pending if key is not None)
+
+    def _flush_sell_audits(self):
+        pending, self._sell_audit_rows = self._sell_audit_rows, []
+        if not pending:
+            return
+        try:
+            insert_sell_evals_many(self._uid, [row for _, row in pending])
+        except Exception as e:
+            logger.error("[AUDIT-SELL] insert failed: %s | uid=%s rows=%d", e, self._uid, len(pending))
+            return
+        MACDStrategy._seen_sell_audits.update(key for key, _ in pending)
+        if self._log_info:
+            logger.info("[AUDIT-SELL] inserted | uid=%s rows=%d", self._uid, len(pending))
+
+    def _flush_audits(self):
+        self._flush_buy_audits()
+        self._flush_sell_audits()
+
+    def _guard_broker_stop(self):
+        """
+        자금 소진 시 backtesting 은 broker.next() 의 _OutOfMoneyError 로 루프를 끊고 next()를 더 부르지 않는다
+        (실행 후 훅 없음) → 브로커 next 를 감싸 중단 직전 버퍼에 남은 감사 행을 적재
+        """
+        broker_next = self._broker.next
+
+        def _next():
+            try:
+                broker_next()
+            except BaseException:
+                self._flush_audits()
+                raise
+
+        self._broker.next = _next
+
+    def _audit_bar_time(self, state) -> str:
+        """현재 봉의 감사로그 bar_time (strategy_engine 과 같은 KST isoformat, 예: 2026-01-15T21:16:00+09:00)"""
+        if self._kst_index is None:
+            return str(state.timestamp)
+        return self._kst_index[self._bar_idx].isoformat()
+
+    def _update_cross_state(self, state):
+        # 크로스 판정은 init()에서 _cross_masks 로 미리 계산한 마스크를 현재 봉 인덱스로 조회
+        #  (의미 필터(최소 분리도/기울기/디바운스)는 현재 임계값이 모두 0 → 항상 통과)
+        i = self._bar_idx
+        if self._golden[i]:
             self.bars_since_cross = 0
             self.golden_cross_pending = True
             self.last_cross_type = "Golden"
             # position_color = "🟢"
-        elif self._is_dead_cross():
+        elif self._dead[i]:
             self.bars_since_cross = 0
             self.golden_cross_pending = False
             self.last_cross_type = "Dead"
@@ -472,17 +672,19 @@ class MACDStrategy(Strategy):
             self.last_cross_type = "Neutral"
             # position_color = "⚪"
 
-        MACDStrategy.log_events.append(
-            (
-                state["bar"],
-                "LOG",
-                self.last_cross_type,
-                state["macd"],
-                state["signal"],
-                state["price"],
-            )
+        self.log_events.record(
+            state.bar,
+            self.last_cross_type,
+            state.macd,
+            state.signal,
+            state.price,
         )
 
+    @classmethod
+    def events_df(cls) -> pd.DataFrame:
+        """log_events 를 DataFrame으로 변환 (분석/리포트용, 클래스 미러 = 마지막 실행 기준)"""
+        return cls.log_events.to_frame()
+
     # --- 주문 이력 기반 Flat 판정 (옵션 훅) ---
     def _is_flat_by_history(self) -> bool | None:
         """
@@ -495,7 +697,7 @@ class MACDStrategy(Strategy):
         try:
             if not hasattr(self, "fetch_orders") or not callable(self.fetch_orders):
                 return None
-            orders = self.fetch_orders(self.user_id, getattr(self, "ticker", "UNKNOWN"), limit=100) or []
+            orders = self.fetch_orders(self._uid, self._ticker, limit=100) or []
             if not isinstance(orders, list):
                 return None
             if len(orders) == 0:
@@ -523,73 +725,27 @@ class MACDStrategy(Strategy):
             # 완료된 주문이 하나도 없으면 Flat로 보수적 간주
             return True
         except Exception as e:
-            logger.debug(f"[HIST] flat-by-history check skipped: {e}")
+            logger.debug("[HIST] flat-by-history check skipped: %s", e)
             return None
         
-    # ★ BUY 체크 정의
-    def _buy_check_defs(self, state, buy_cond):
-        return [
-            ("golden_cross", buy_cond.get("golden_cross", False),
-             lambda: self.golden_cross_pending and self.last_cross_type == "Golden"),
-            ("macd_positive", buy_cond.get("macd_positive", False),
-             lambda: self._is_macd_cross_up(self.macd_threshold)),
-            ("signal_positive", buy_cond.get("signal_positive", False),
-             lambda: self._is_signal_cross_up(self.macd_threshold)),
-            ("bullish_candle", buy_cond.get("bullish_candle", False),
-             self._is_bullish_candle),
-            ("macd_trending_up", buy_cond.get("macd_trending_up", False),
-             self._is_macd_trending_up),
-            ("above_ma20", buy_cond.get("above_ma20", False),
-             self._is_above_ma20),
-            ("above_ma60", buy_cond.get("above_ma60", False),
-             self._is_above_ma60),
-        ]
-
-    # ★ BUY 체크 실행
-    def _run_buy_checks(self, state, buy_cond):
-        passed, failed, details = [], [], {}
-        for name, enabled, fn in self._buy_check_defs(state, buy_cond):
-            if not enabled:
-                continue
-            try:
-                ok = bool(fn()) if callable(fn) else bool(fn)
-            except Exception as e:
-                logger.error(f"❌ BUY 체크 '{name}' 실행 오류: {e}")
-                ok = False
-            details[name] = ok
-            logger.info(f"🧪 BUY 체크 '{name}': enabled=True -> {'PASS' if ok else 'FAIL'}")
-            (passed if ok else failed).append(name)
-
-        if self.signal_confirm_enabled:
-            ok = self._is_signal_cross_up(self.macd_threshold)
-            details["signal_confirm"] = ok
-            logger.info(
-                f"🧪 BUY 체크 'signal_confirm': enabled=True -> {'PASS' if ok else 'FAIL'} "
-                f"(signal={state['signal']:.5f}, threshold={self.macd_threshold:.5f})"
-            )
-            (passed if ok else failed).append("signal_confirm")
-
-        overall_ok = (len(failed) == 0)
-        return overall_ok, passed, failed, details
-
-    def _evaluate_buy(self):
-        ticker = getattr(self, "ticker", "UNKNOWN")
+    def _evaluate_buy(self, state):
+        ticker = self._ticker
 
         # --- 0) 실제 포지션: 엔진이 말하는 게 진실 ---
-        inpos = bool(getattr(getattr(self, "position", None), "size", 0) > 0)
+        inpos = self.position.size > 0
 
         # --- 1) 참고 정보 (오류 나면 False로) ---
         try:
-            db_open = has_open_by_orders(self.user_id, ticker)
+            db_open = has_open_by_orders(self._uid, ticker)
         except Exception as e:
-            logger.error(f"[BUY-GATE] has_open_by_orders 실패: {e}")
+            logger.error("[BUY-GATE] has_open_by_orders 실패: %s", e)
             db_open = False
 
         wallet_open = None
-        if hasattr(self, "has_wallet_position") and callable(self.has_wallet_position):
+        if self._has_wallet_hook:
             try:
                 # 월렛 훅 호출 시 정규화된 티커 사용
-                wallet_open = bool(self.has_wallet_position(self._norm_ticker(ticker)))
+                wallet_open = bool(self.has_wallet_position(self._wallet_ticker))
             except Exception:
                 wallet_open = None      
 
@@ -599,78 +755,62 @@ class MACDStrategy(Strategy):
         # 지갑이 보유(True)면 BUY 평가를 확실히 차단하도록 반영
         blocked = inpos or (False if self.ignore_wallet_gate else bool(wallet_open)) or (False if self.ignore_db_gate else bool(db_open))
 
-        state = self._current_state()
-
         # --- 3) 고아 엔트리 정리 ---
-        if (not blocked) and (getattr(self, "entry_price", None) is not None) and (not inpos):
+        if (not blocked) and (self.entry_price is not None) and (not inpos):
             self._reset_entry()
             logger.info("🧹 고아 엔트리 정리: 엔진은 미보유 → entry 리셋")
 
         # --- 4) 보유로 차단되면 감사만 적재하고 스킵 ---
         if blocked:
             if AUDIT_LOG_SKIP_POS:
-                if not (AUDIT_DEDUP_PER_BAR and self._last_skippos_audit_bar == state["bar"]):
-                    if (AUDIT_SKIP_POS_SAMPLE_N is None) or (AUDIT_SKIP_POS_SAMPLE_N <= 0) or (state["bar"] % AUDIT_SKIP_POS_SAMPLE_N == 0):
-                        try:
-                            insert_buy_eval(
-                                user_id=self.user_id,
-                                ticker=ticker,
-                                interval_sec=getattr(self,"interval_sec",60),
-                                bar=state["bar"],
-                                price=state["price"],
-                                macd=state["macd"],
-                                signal=state["signal"],
-                                have_position=True,
-                                overall_ok=False,
-                                failed_keys=[],
-                                checks={"note":"blocked_by_position"},
-                                notes="BUY_SKIP_POS" + f" | ts_bt={state['timestamp']} bar_bt={state['bar']}",
-                                timestamp=None  # ✅ 실시간 시각으로 저장 (now_kst())
-                            )
-                            self._last_skippos_audit_bar = state["bar"]
-                            # logger.info(f"[AUDIT-BUY] inserted | bar={state['bar']} note=BUY_SKIP_POS")
-                        except Exception as e:
-                            logger.error(f"[AUDIT-BUY] insert failed(SKIP_POS): {e} | bar={state['bar']}")
-            logger.debug(f"[BUY] SKIP (보유 차단) | bar={state['bar']} price={state['price']:.6f}")
+                if not (AUDIT_DEDUP_PER_BAR and self._last_skippos_audit_bar == state.bar):
+                    if (AUDIT_SKIP_POS_SAMPLE_N is None) or (AUDIT_SKIP_POS_SAMPLE_N <= 0) or (state.bar % AUDIT_SKIP_POS_SAMPLE_N == 0):
+                        self._queue_buy_audit(None, dict(
+                            ticker=ticker,
+                            interval_sec=self._interval_sec,
+                            bar=state.bar,
+                            price=state.price,
+                            macd=state.macd,
+                            signal=state.signal,
+                            have_position=True,
+                            overall_ok=False,
+                            failed_keys=[],
+                            checks={"note":"blocked_by_position"},
+                            notes="BUY_SKIP_POS" + f" | ts_bt={state.timestamp} bar_bt={state.bar}",
+                            bar_time=self._audit_bar_time(state),
+                        ))
+                        self._last_skippos_audit_bar = state.bar
+            logger.debug("[BUY] SKIP (blocked by position) | bar=%s price=%.6f", state.bar, state.price)
             return
 
-        # 정상 BUY 평가/체결
-        state = self._current_state()
-
-        buy_cond = self.conditions.get("buy", {})
-        report, enabled_keys, failed_keys, overall_ok = self._buy_checks_report(state, buy_cond)
-
         # ✅ 프로세스 내 동일 바 dedup (timestamp 기반으로 정확한 중복 방지)
-        bar_timestamp = str(state["timestamp"])
-        key = (self.user_id, ticker, getattr(self,"interval_sec",60), bar_timestamp)
+        bar_timestamp = str(state.timestamp)
+        key = (self._uid, ticker, self._interval_sec, bar_timestamp)
         if key in MACDStrategy._seen_buy_audits:
             return
 
         # ✅ BUY 조건이 하나도 켜져 있지 않아도 기록 (모니터링 목적)
-        if len(enabled_keys) == 0:
-            try:
-                insert_buy_eval(
-                    user_id=self.user_id,
-                    ticker=ticker,
-                    interval_sec=getattr(self,"interval_sec",60),
-                    bar=state["bar"],
-                    price=state["price"],
-                    macd=state["macd"],
-                    signal=state["signal"],
-                    have_position=False,
-                    overall_ok=False,
-                    failed_keys=[],
-                    checks={},
-                    notes="NO_ENABLED_CONDITIONS | " + f"ts_bt={state['timestamp']} bar_bt={state['bar']}",
-                    timestamp=None
-                )
-                MACDStrategy._seen_buy_audits.add(key)
-            except Exception as e:
-                logger.error(f"[AUDIT-BUY] insert failed(NO_COND): {e} | bar={state['bar']}")
+        if not (self._buy_mask or self.signal_confirm_enabled):
+            self._queue_buy_audit(key, dict(
+                ticker=ticker,
+                interval_sec=self._interval_sec,
+                bar=state.bar,
+                price=state.price,
+                macd=state.macd,
+                signal=state.signal,
+                have_position=False,
+                overall_ok=False,
+                failed_keys=[],
+                checks={},
+                notes="NO_ENABLED_CONDITIONS | " + f"ts_bt={state.timestamp} bar_bt={state.bar}",
+                bar_time=self._audit_bar_time(state),
+            ))
             return
-        
+
+        # 정상 BUY 평가/체결 (켜진 조건이 있을 때만 리포트 생성)
+        report, enabled_keys, failed_keys, overall_ok = self._buy_checks_report(state)
+
         # ✅ BUY 상태 서명: 활성 조건들의 pass 맵 + 크로스 상태만 사용(숫자값 제외)
-        import hashlib
         pass_map = {k: 1 if report.get(k, {}).get("pass", 0) == 1 else 0 for k in enabled_keys}
         buy_sig = hashlib.md5(json.dumps({
             "pass_map": pass_map,
@@ -678,98 +818,95 @@ class MACDStrategy(Strategy):
             "last_cross": self.last_cross_type,
         }, sort_keys=True, default=str).encode()).hexdigest()
 
-        # 감사 적재 - 매 봉마다 기록 (클래스 변수로 이미 중복 방지됨)
-        try:
-            insert_buy_eval(
-                user_id=self.user_id,
-                ticker=ticker,
-                interval_sec=getattr(self,"interval_sec",60),
-                bar=state["bar"],
-                price=state["price"],
-                macd=state["macd"],
-                signal=state["signal"],
-                have_position=False,
-                overall_ok=overall_ok,
-                failed_keys=failed_keys,
-                checks=report,
-                notes=("OK" if overall_ok else "FAILED") + f" | ts_bt={state['timestamp']} bar_bt={state['bar']}",
-                timestamp=None  # ✅ 실시간 시각으로 저장 (now_kst())
-            )
-            MACDStrategy._seen_buy_audits.add(key)
-            self._last_buy_audit_bar = state["bar"]
-            self._last_buy_audit_ts = str(state["timestamp"])
-            self._last_buy_sig = buy_sig
-            # logger.info(f"[AUDIT-BUY] inserted | bar={state['bar']} overall_ok={overall_ok}")
-        except Exception as e:
-            logger.error(f"[AUDIT-BUY] insert failed: {e} | bar={state['bar']}")
+        # 감사 적재 - 매 봉마다 기록 (클래스 변수로 이미 중복 방지됨, 버퍼 후 일괄 적재)
+        self._queue_buy_audit(key, dict(
+            ticker=ticker,
+            interval_sec=self._interval_sec,
+            bar=state.bar,
+            price=state.price,
+            macd=state.macd,
+            signal=state.signal,
+            have_position=False,
+            overall_ok=overall_ok,
+            failed_keys=failed_keys,
+            checks=report,
+            notes=("OK" if overall_ok else "FAILED") + f" | ts_bt={state.timestamp} bar_bt={state.bar}",
+            bar_time=self._audit_bar_time(state),
+        ))
+        self._last_buy_audit_bar = state.bar
+        self._last_buy_audit_ts = bar_timestamp
+        self._last_buy_sig = buy_sig
 
         if not overall_ok:
             # if failed_keys:
             #     logger.info(f"⏸️ BUY 보류 | 실패 조건: {failed_keys}")
             return
 
-        reasons = [k for k in enabled_keys if report[k]["pass"] == 1]
-        self._buy_action(state, reasons=reasons, details=report)
+        # overall_ok → 활성 조건 전부 통과 → 통과 마스크 = 활성 마스크
+        self._buy_action(state, passed_mask=self._buy_enabled_mask, details=report)
     
-    def _buy_action(self, state, reasons: list[str], details: dict | None = None):
+    def _buy_action(self, state, passed_mask: int, details: dict | None = None):
+        reason_str = _buy_reason(passed_mask)
         # 같은 bar 중복 BUY 방지
-        if getattr(self, "_last_buy_bar", None) == state["bar"]:
-            logger.info(f"⏹️ DUPLICATE BUY SKIP | bar={state['bar']} reasons={' + '.join(reasons) if reasons else ''}")
+        if self._last_buy_bar == state.bar:
+            if self._log_info:
+                logger.info("⏹️ DUPLICATE BUY SKIP | bar=%s reasons=%s", state.bar, reason_str)
             return
 
         self.buy()
 
         # 엔트리/피크/트레일링 상태 초기화
-        self.entry_price = state["price"]
-        self.entry_bar = state["bar"]
+        self.entry_price = state.price
+        self.entry_bar = state.bar
         self.highest_price = self.entry_price
         # ✅ 수정: TP 달성 전까지는 TS 비활성화 (TP 도달 시 armed)
         self.trailing_armed = False
         self.golden_cross_pending = False
 
-        reason_str = "+".join(reasons) if reasons else "BUY"
         self._emit_trade("BUY", state, reason=reason_str)
-        self._last_buy_bar = state["bar"]
+        self._last_buy_bar = state.bar
 
-    def _evaluate_sell(self):
-        ticker = getattr(self, "ticker", "UNKNOWN")
+    def _evaluate_sell(self, state):
+        ticker = self._ticker
 
-         # ★ 디버깅: 현재 상태 로깅
-        logger.info(f"[SELL-DEBUG] ========== SELL EVALUATION START ==========")
-        logger.info(f"[SELL-DEBUG] ticker={ticker}")
-        logger.info(f"[SELL-DEBUG] self.position={getattr(self, 'position', None)}")
-        logger.info(f"[SELL-DEBUG] self.entry_price={getattr(self, 'entry_price', None)}")
-        logger.info(f"[SELL-DEBUG] self.entry_bar={getattr(self, 'entry_bar', None)}")
+         # ★ 디버깅: 현재 상태 로깅 (매 봉 출력 → DEBUG 레벨)
+        log_debug = self._log_debug
+        if log_debug:
+            logger.debug("[SELL-DEBUG] ========== SELL EVALUATION START ==========")
+            logger.debug("[SELL-DEBUG] ticker=%s", ticker)
+            logger.debug("[SELL-DEBUG] self.position=%s", getattr(self, "position", None))
+            logger.debug("[SELL-DEBUG] self.entry_price=%s", getattr(self, "entry_price", None))
+            logger.debug("[SELL-DEBUG] self.entry_bar=%s", getattr(self, "entry_bar", None))
 
         # ★ 백테스트 포지션과 지갑 포지션을 모두 확인
-        has_bt_position = bool(getattr(getattr(self, "position", None), "size", 0) > 0)
+        has_bt_position = self.position.size > 0
         has_wallet_pos = False
 
         try:
-            if hasattr(self, "has_wallet_position") and callable(self.has_wallet_position):
-                has_wallet_pos = bool(self.has_wallet_position(self._norm_ticker(ticker)))
-                logger.info(f"[SELL] wallet check: {has_wallet_pos}")
+            if self._has_wallet_hook:
+                has_wallet_pos = bool(self.has_wallet_position(self._wallet_ticker))
+                if log_debug:
+                    logger.debug("[SELL] wallet check: %s", has_wallet_pos)
         except Exception as e:
-            logger.warning(f"[SELL] wallet check failed: {e}")
+            logger.warning("[SELL] wallet check failed: %s", e)
             has_wallet_pos = False
 
-        logger.info(f"[SELL] ENTRY CHECK | has_bt_position={has_bt_position}, has_wallet_pos={has_wallet_pos}")
+        if log_debug:
+            logger.debug("[SELL] ENTRY CHECK | has_bt_position=%s, has_wallet_pos=%s", has_bt_position, has_wallet_pos)
 
         # ★ 둘 다 없을 때만 스킵 (OR 조건)
         if not has_bt_position and not has_wallet_pos:
-            logger.info("[SELL] SKIP: no position in both BT and wallet")
+            if log_debug:
+                logger.debug("[SELL] SKIP: no position in both BT and wallet")
             return
 
         # ★ 백테스트나 지갑 중 하나라도 보유 중이면 SELL 평가 진행
-        logger.info("[SELL] PROCEED: position detected")
-
-        state = self._current_state()
+        if log_debug:
+            logger.debug("[SELL] PROCEED: position detected")
 
         # Phase 1: Boot Filter 제거 (매도는 포지션 보호 최우선, 중복 방지는 _last_sell_bar로 처리)
 
-        bar_ts = str(state["timestamp"])
-
-        sell_cond = self.conditions.get("sell", {})
+        bar_ts = str(state.timestamp)
 
         # =========================
         # 엔트리 하이드레이션:
@@ -779,67 +916,58 @@ class MACDStrategy(Strategy):
         if self.entry_price is None:
             try:
                 if hasattr(self, "get_wallet_entry_price") and callable(self.get_wallet_entry_price):
-                    ep = self.get_wallet_entry_price(self._norm_ticker(ticker))
+                    ep = self.get_wallet_entry_price(self._wallet_ticker)
                     if ep is None:
                         ep = self.get_wallet_entry_price(ticker)
                     if ep is not None:
                         self.entry_price = float(ep)
                         if self.entry_bar is None:
-                            self.entry_bar = state["bar"]
-                        logger.info(f"[SELL] ✅ entry_price recovered from wallet: {self.entry_price}")
+                            self.entry_bar = state.bar
+                        logger.info("[SELL] ✅ entry_price recovered from wallet: %s", self.entry_price)
             except Exception as e:
-                logger.warning(f"[SELL] ⚠️ entry hydrate failed: {e}")
+                logger.warning("[SELL] ⚠️ entry hydrate failed: %s", e)
 
         # ★ 복구 실패 시 대체 로직 (CRITICAL FIX)
         if self.entry_price is None:
-            logger.warning(f"[SELL] ⚠️ entry_price is None after recovery attempt")
+            logger.warning("[SELL] ⚠️ entry_price is None after recovery attempt")
 
             # 옵션 1: 현재가를 entry_price로 설정 (보수적)
             # 주의: TP/SL 계산이 부정확하므로 전략 기반 매도만 허용
-            self.entry_price = state["price"]
-            self.entry_bar = state["bar"]
-            logger.warning(f"[SELL] 🔧 FALLBACK: entry_price set to current price: {self.entry_price}")
+            self.entry_price = state.price
+            self.entry_bar = state.bar
+            logger.warning("[SELL] 🔧 FALLBACK: entry_price set to current price: %s", self.entry_price)
 
             # 옵션 2: TP/SL 없이 전략 기반 매도만 허용 (더 보수적)
             # logger.info("[SELL] Proceeding with strategy-based SELL only (no TP/SL)")
             # (이 경우 TP/SL 체크 부분을 건너뛰도록 아래 로직 수정 필요)
 
-        tp_price = self.entry_price * (1 + self.take_profit)
-        sl_price = self.entry_price * (1 - self.stop_loss)
-        bars_held = state["bar"] - self.entry_bar if self.entry_bar is not None else 0
+        tp_price = self._tp_price
+        sl_price = self._sl_price
+        bars_held = state.bar - self.entry_bar if self.entry_bar is not None else 0
+        min_sell_bar = self._min_sell_bar
+        hold_ok = (state.bar >= min_sell_bar) if min_sell_bar is not None else (self.min_holding_period <= 0)
 
         eps = 1e-8
-        checks = {}
-
-        def add(name, enabled, passed, raw=None):
-            checks[name] = {"enabled": 1 if enabled else 0, "pass": 1 if passed else 0, "value": raw}
 
         # Stop Loss
-        sl_enabled = sell_cond.get("stop_loss", False)
-        sl_hit = state["price"] <= sl_price + eps
-        add("stop_loss", sl_enabled, sl_hit, {"price":state["price"], "sl_price":sl_price})
+        sl_enabled = self._c_sl
+        sl_hit = state.price <= sl_price + eps
 
         # ✅ 수정: Take Profit 먼저 체크 (TS armed 트리거용)
-        tp_enabled = sell_cond.get("take_profit", False)
-        tp_reached = (state["price"] >= tp_price - eps)
-        ts_enabled = sell_cond.get("trailing_stop", False)
+        tp_enabled = self._c_tp
+        tp_reached = (state.price >= tp_price - eps)
+        ts_enabled = self._c_ts
 
         # TP 도달 시 TS armed 활성화 (TS가 ON일 때만)
         if tp_enabled and tp_reached and ts_enabled:
             if not self.trailing_armed:
                 self.trailing_armed = True
-                self.highest_price = state["price"]  # TP 도달 시점부터 최고가 추적 시작
-                logger.info(f"🎯 TP 도달 → TS ARMED | tp_price={tp_price:.2f} current={state['price']:.2f}")
+                self.highest_price = state.price  # TP 도달 시점부터 최고가 추적 시작
+                if self._log_info:
+                    logger.info("🎯 TP 도달 → TS ARMED | tp_price=%.2f current=%.2f", tp_price, state.price)
 
         # TP 매도 조건: TS가 OFF이거나 TP_WITH_TS=True일 때만 즉시 매도
         tp_hit = tp_reached and (TP_WITH_TS or (not ts_enabled))
-        add("take_profit", tp_enabled, tp_hit, {
-            "price": state["price"],
-            "tp_price": tp_price,
-            "ts_enabled": ts_enabled,
-            "tp_reached": tp_reached,
-            "will_sell": tp_hit
-        })
 
         # Trailing Stop (TP 도달 후 armed 상태에서만 작동)
         if ts_enabled:
@@ -847,14 +975,14 @@ class MACDStrategy(Strategy):
 
             # ✅ armed 상태일 때만 최고가 갱신
             if ts_armed:
-                if (self.highest_price is None) or (state["price"] > self.highest_price):
-                    self.highest_price = state["price"]
+                if (self.highest_price is None) or (state.price > self.highest_price):
+                    self.highest_price = state.price
 
             highest = self.highest_price
 
             # ✅ TP 가격 보호: trailing_limit의 최소값을 TP 가격으로 설정
             if highest is not None:
-                raw_limit = highest * (1 - self.trailing_stop_pct)
+                raw_limit = highest * self._one_minus_ts
                 trailing_limit = max(tp_price, raw_limit)  # TP 이상 보장
             else:
                 trailing_limit = None
@@ -862,32 +990,68 @@ class MACDStrategy(Strategy):
             ts_hit = (
                 ts_armed
                 and (trailing_limit is not None)
-                and (bars_held >= self.min_holding_period)
-                and (state["price"] <= trailing_limit + eps)
+                and hold_ok
+                and (state.price <= trailing_limit + eps)
             )
+            if log_debug and ts_armed and highest is not None:
+                logger.debug(
+                    "[TS-CHK] armed=True price=%.2f high=%.2f limit=%.2f (raw=%.2f, tp=%.2f) pct=%.3f",
+                    state.price, highest, trailing_limit, raw_limit, tp_price, self.trailing_stop_pct,
+                )
         else:
             ts_armed, highest, trailing_limit, ts_hit = False, self.highest_price, None, False
 
-        add("trailing_stop", ts_enabled, ts_hit, {
-            "armed": ts_armed, "highest": highest, "limit": trailing_limit,
-            "pct": getattr(self,"trailing_stop_pct", None),
-            "bars_held": bars_held, "min_hold": self.min_holding_period
-        })
-
         # MACD Negative
-        macdneg_enabled = sell_cond.get("macd_negative", False)
-        macdneg_hit = self._is_macd_cross_down(self.macd_threshold)
-        add("macd_negative", macdneg_enabled, macdneg_hit, {"macd":state["macd"], "thr":self.macd_threshold})
+        macdneg_enabled = self._c_macd_neg
+        macdneg_hit = bool(self._macd_down[self._bar_idx])
 
         # Signal Negative
-        signalneg_enabled = sell_cond.get("signal_negative", False)
-        signalneg_hit = self._is_signal_cross_down(self.macd_threshold)
-        add("signal_negative", signalneg_enabled, signalneg_hit, {"signal":state["signal"], "thr":self.macd_threshold})
+        signalneg_enabled = self._c_signal_neg
+        signalneg_hit = bool(self._signal_down[self._bar_idx])
 
         # Dead Cross
-        dead_enabled = sell_cond.get("dead_cross", False)
-        dead_hit = self._is_dead_cross()
-        add("dead_cross", dead_enabled, dead_hit, {"macd":state["macd"], "signal":state["signal"]})
+        dead_enabled = self._c_dead
+        dead_hit = bool(self._dead[self._bar_idx])
+
+        # 감사용 체크 맵: 판정이 끝난 뒤 dict 리터럴 1회로 구성 (봉마다 add 클로저 생성/호출 없음)
+        #  - 감사 버퍼에 쌓인 행이 이 dict 를 그대로 참조하므로 봉 사이에 재사용하지 않는다
+        thr = self.macd_threshold
+        checks = {
+            "stop_loss": {
+                "enabled": 1 if sl_enabled else 0, "pass": 1 if sl_hit else 0,
+                "value": {"price": state.price, "sl_price": sl_price},
+            },
+            "take_profit": {
+                "enabled": 1 if tp_enabled else 0, "pass": 1 if tp_hit else 0,
+                "value": {
+                    "price": state.price,
+                    "tp_price": tp_price,
+                    "ts_enabled": ts_enabled,
+                    "tp_reached": tp_reached,
+                    "will_sell": tp_hit
+                },
+            },
+            "trailing_stop": {
+                "enabled": 1 if ts_enabled else 0, "pass": 1 if ts_hit else 0,
+                "value": {
+                    "armed": ts_armed, "highest": highest, "limit": trailing_limit,
+                    "pct": self.trailing_stop_pct,
+                    "bars_held": bars_held, "min_hold": self.min_holding_period
+                },
+            },
+            "macd_negative": {
+                "enabled": 1 if macdneg_enabled else 0, "pass": 1 if macdneg_hit else 0,
+                "value": {"macd": state.macd, "thr": thr},
+            },
+            "signal_negative": {
+                "enabled": 1 if signalneg_enabled else 0, "pass": 1 if signalneg_hit else 0,
+                "value": {"signal": state.signal, "thr": thr},
+            },
+            "dead_cross": {
+                "enabled": 1 if dead_enabled else 0, "pass": 1 if dead_hit else 0,
+                "value": {"macd": state.macd, "signal": state.signal},
+            },
+        }
 
         # 트리거 판단 (전략 우선순위 유지)
         trigger_key = None
@@ -905,34 +1069,34 @@ class MACDStrategy(Strategy):
             trigger_key = "Dead Cross"
 
         # --- SELL 감사 적재: 트리거/상태변화/샘플링일 때만 ---
-        import hashlib, json
-        # ✅ bars_held는 해시에서 제외 (매 바 증가로 인한 과도한 적재 방지)
-        sig = hashlib.md5(json.dumps({
-            "armed": ts_armed,
-            "highest": round((self.highest_price or 0.0), 6),
-            "pass_map": {k:v["pass"] for k,v in checks.items() if v.get("enabled")==1}
-        }, sort_keys=True, default=str).encode()).hexdigest()
+        # ✅ 상태 서명: (ARM, 최고가, 활성 조건 pass 맵) 튜플 — 같은 상태면 같은 값, 해시 가능(dedup 키에 그대로 사용)
+        #    bars_held는 제외 (매 바 증가로 인한 과도한 적재 방지), checks 키 순서는 고정이라 정렬 불필요
+        sig = (
+            ts_armed,
+            round((self.highest_price or 0.0), 6),
+            tuple((k, v["pass"]) for k, v in checks.items() if v.get("enabled") == 1),
+        )
 
         should_insert = (trigger_key is not None)
         if not should_insert:
             # 상태 변화시에만 적재, 그 외에는 샘플링 주기로만 적재
             if sig != self._last_sell_sig:
                 should_insert = True
-            elif self._sell_sample_n and (state["bar"] % self._sell_sample_n == 0):
+            elif self._sell_sample_n and (state.bar % self._sell_sample_n == 0):
                 should_insert = True
 
         # ★ "매 바 1회" 강제 — 새 바가 열렸다면 최소 1회는 기록
         #   - 디버깅/모니터링 단계에서 SELL 평가가 '안 올라오는 것처럼' 보이는 현상 해소
         #   - 이전에 기록한 bar와 현재 bar가 다르면 이번 bar에서 1회 적재 허용
         if not should_insert:
-            if getattr(self, "_last_sell_audit_ts", None) != bar_ts:
+            if self._last_sell_audit_ts != bar_ts:
                 should_insert = True
 
         # --- SELL 감사 적재 직전 ---
         audit_key = (
-            self.user_id,
-            getattr(self, "ticker", "UNKNOWN"),
-            getattr(self, "interval_sec", 60),
+            self._uid,
+            ticker,
+            self._interval_sec,
             bar_ts,
             sig,  # 상태 해시 사용(권장). 단순 바만 쓰려면 sig를 빼면 됨.
         )
@@ -941,79 +1105,35 @@ class MACDStrategy(Strategy):
             should_insert = False  # 이미 같은 상태를 같은 바에서 기록했음 → 스킵
             
         if should_insert:
-            try:
-                insert_sell_eval(
-                    user_id=self.user_id,
-                    ticker=getattr(self,"ticker","UNKNOWN"),
-                    interval_sec=getattr(self,"interval_sec",60),
-                    bar=state["bar"], price=state["price"],
-                    macd=state["macd"], signal=state["signal"],
-                    tp_price=tp_price, sl_price=sl_price,
-                    highest=self.highest_price, ts_pct=getattr(self,"trailing_stop_pct", None),
-                    ts_armed=self.trailing_armed, bars_held=bars_held,
-                    checks=checks,
-                    triggered=(trigger_key is not None),
-                    trigger_key=trigger_key,
-                    notes="",
-                    timestamp=None  # ✅ 실시간 시각으로 저장 (now_kst())
-                )
-                MACDStrategy._seen_sell_audits.add(audit_key)
-                self._last_sell_sig = sig
-                self._last_sell_audit_ts = bar_ts
-                logger.info(f"[AUDIT-SELL] inserted | uid={getattr(self,'user_id',None)} ts={bar_ts} trigger={trigger_key}")
-            except Exception as e:
-                logger.error(f"[AUDIT-SELL] insert failed: {e} | uid={getattr(self,'user_id',None)} ts={bar_ts} checks_keys={list(checks.keys())}")
-
-        # Stop Loss
-        if sl_enabled and sl_hit:
-            logger.info("🛑 SL HIT → SELL")
-            self._sell_action(state, "Stop Loss")
-            return
-
-        # Trailing Stop (armed 상태일 때만 작동)
-        if ts_enabled and self.trailing_armed:
-            if self.highest_price is not None:
-                # ✅ TP 가격 보호
-                raw_limit = self.highest_price * (1 - self.trailing_stop_pct)
-                trailing_limit = max(tp_price, raw_limit)
-                logger.info(
-                    f"🔧 TS CHECK | armed=True price={state['price']:.2f} high={self.highest_price:.2f} "
-                    f"limit={trailing_limit:.2f} (raw={raw_limit:.2f}, tp={tp_price:.2f}) pct={self.trailing_stop_pct:.3f}"
-                )
-                if bars_held >= self.min_holding_period and state["price"] <= trailing_limit + eps:
-                    logger.info("🛑 TS HIT → SELL")
-                    self._sell_action(state, "Trailing Stop")
-                    return
-
-        # Take Profit (TS가 OFF이거나 TP_WITH_TS=True일 때만 즉시 매도)
-        if tp_enabled and tp_hit:
-            logger.info("💰 TP HIT (TS OFF or TP_WITH_TS=True) → SELL")
-            self._sell_action(state, "Take Profit")
-            return
-
-        # MACD Negative
-        if macdneg_enabled and macdneg_hit:
-            logger.info("📉 MACD < threshold → SELL")
-            self._sell_action(state, "MACD Negative")
-            return
-        
-        # Signal Negative
-        if signalneg_enabled and signalneg_hit:
-            logger.info("📉 Signal < threshold → SELL")
-            self._sell_action(state, "Signal Negative")
-            return
-
-        # Dead Cross
-        if dead_enabled and self._is_dead_cross():
-            logger.info("🛑 Dead Cross → SELL")
-            self._sell_action(state, "Dead Cross")
-            return
+            self._queue_sell_audit(audit_key, dict(
+                ticker=ticker,
+                interval_sec=self._interval_sec,
+                bar=state.bar, price=state.price,
+                macd=state.macd, signal=state.signal,
+                tp_price=tp_price, sl_price=sl_price,
+                highest=self.highest_price, ts_pct=self.trailing_stop_pct,
+                ts_armed=self.trailing_armed, bars_held=bars_held,
+                checks=checks,
+                triggered=(trigger_key is not None),
+                trigger_key=trigger_key,
+                notes="",
+                bar_time=self._audit_bar_time(state),
+            ), flush=trigger_key is not None)   # 매도 트리거 행은 버퍼에 남기지 않고 즉시 적재
+            self._last_sell_sig = sig
+            self._last_sell_audit_ts = bar_ts
+
+        # 매도 실행: 위에서 우선순위대로 고른 trigger_key 그대로 사용 (조건 재평가 없음)
+        if trigger_key is not None:
+            if self._log_info:
+                logger.info(_SELL_TRIGGER_LOGS[trigger_key])
+            self._sell_action(state, trigger_key)
 
     def _sell_action(self, state, reason):
-        if getattr(self, "_last_sell_bar", None) == state["bar"]:
-            logger.info(f"⏹️ DUPLICATE SELL SKIP | bar={state['bar']} reason={reason}")
+        if self._last_sell_bar == state.bar:
+            if self._log_info:
+                logger.info("⏹️ DUPLICATE SELL SKIP | bar=%s reason=%s", state.bar, reason)
             return
-        self._last_sell_bar = state["bar"]
+        self._last_sell_bar = state.bar
         
         self.position.close()
         self._emit_trade("SELL", state, reason=reason)
@@ -1027,53 +1147,175 @@ class MACDStrategy(Strategy):
         self.golden_cross_pending = False
 
     # 공통 이벤트 헬퍼 (BUY/SELL 모두에 사용)
-    def _emit_trade(self, kind: str, state: dict, reason: str = ""):
-        evt = {
-            "bar": state["bar"],
-            "type": kind,
-            "reason": reason,
-            "timestamp": state["timestamp"],
-            "price": state["price"],
-            "macd": state["macd"],
-            "signal": state["signal"],
-            "entry_price": self.entry_price,
-            "entry_bar": self.entry_bar,
-            "bars_held": state["bar"] - (self.entry_bar if self.entry_bar is not None else state["bar"]),
-            "tp": (self.entry_price * (1 + self.take_profit)) if self.entry_price else None,
-            "sl": (self.entry_price * (1 - self.stop_loss)) if self.entry_price else None,
-            "highest": self.highest_price,
-            "ts_pct": getattr(self, "trailing_stop_pct", None),
-            "ts_armed": getattr(self, "trailing_armed", False),
-        }
-        MACDStrategy.trade_events.append(evt)
+    def _emit_trade(self, kind: str, state: _BarState, reason: str = ""):
+        # 필드 순서 = strategy_events.TRADE_FIELDS (컬럼 버퍼에 인덱스 기록)
+        entry_bar = self.entry_bar
+        has_entry = bool(self.entry_price)
+        self.trade_events.record(
+            state.bar,
+            kind,
+            reason,
+            state.timestamp,
+            state.price,
+            state.macd,
+            state.signal,
+            self.entry_price,
+            entry_bar,
+            state.bar - (entry_bar if entry_bar is not None else state.bar),
+            self._tp_price if has_entry else None,
+            self._sl_price if has_entry else None,
+            self.highest_price,
+            self.trailing_stop_pct,
+            self.trailing_armed,
+        )
+
+    @classmethod
+    def trade_events_df(cls) -> pd.DataFrame:
+        """trade_events 를 DataFrame으로 변환 (백테스트 후 분석용, 클래스 미러 = 마지막 실행 기준)"""
+        return cls.trade_events.to_frame()
+
+    # 고속 경로에서 덮어쓸 수 있는 파라미터
+    _FAST_PARAMS = (
+        "fast_period", "slow_period", "signal_period", "take_profit", "stop_loss",
+        "macd_threshold", "min_holding_period", "signal_confirm_enabled",
+        "volatility_window", "trailing_stop_pct",
+    )
+
+    @classmethod
+    def run_fast(cls, df: pd.DataFrame, conditions: dict | None = None, user_id: str | None = None, **params) -> pd.DataFrame:
+        """
+        Backtest.run() 없이 매수/매도 판정만 단일 커널로 실행 (파라미터 그리드 탐색용).
+        - 판정 규칙/우선순위/체결 시점은 MACDStrategy 와 동일
+        - 감사 로그/DB/지갑 게이트/이벤트 버퍼는 사용하지 않음
+        - conditions 미지정 시 user_id(없으면 클래스 user_id)의 컨디션 파일 사용
+
+        반환: 트레이드 DataFrame
+            bar(df 위치 인덱스), type, reason, timestamp, price, entry_price, bars_held, ts_armed
+        """
+        p = cls._fast_params(params)
+        conditions = cls._fast_conditions(conditions, user_id)
+        buy_flags, sell_flags = _condition_flags(conditions)
+        buy_mask = _flags_to_mask(buy_flags)
+        if p["signal_confirm_enabled"]:
+            buy_mask |= strategy_fast.BUY_SIGNAL_CONFIRM
+        sell_mask = _flags_to_mask(sell_flags)
+
+        close = np.ascontiguousarray(df["Close"].to_numpy(dtype=np.float64))
+        open_ = np.ascontiguousarray(df["Open"].to_numpy(dtype=np.float64))
+        n = len(close)
+
+        # Backtest 워밍업과 동일: 1 + (MA20/MA60/변동성 지표의 첫 유효 인덱스 중 최댓값)
+        warm = max((w - 1 if n >= w else 0) for w in (20, 60, int(p["volatility_window"])))
+        start = 1 + warm
+
+        out_bar = np.empty(n, dtype=np.int64)
+        out_kind = np.empty(n, dtype=np.int8)
+        out_code = np.empty(n, dtype=np.int64)
+        out_price = np.empty(n, dtype=np.float64)
+        out_entry = np.empty(n, dtype=np.float64)
+        out_bars_held = np.empty(n, dtype=np.int64)
+        out_armed = np.empty(n, dtype=np.bool_)
+
+        k = strategy_fast.macd_backtest_kernel(
+            open_, close,
+            int(p["fast_period"]), int(p["slow_period"]), int(p["signal_period"]), start,
+            float(p["take_profit"]), float(p["stop_loss"]), float(p["trailing_stop_pct"]),
+            int(p["min_holding_period"]), float(p["macd_threshold"]),
+            buy_mask, sell_mask, bool(TP_WITH_TS),
+            out_bar, out_kind, out_code, out_price, out_entry, out_bars_held, out_armed,
+        )
+
+        reasons = []
+        for kind, code in zip(out_kind[:k], out_code[:k]):
+            if kind == strategy_fast.KIND_SELL:
+                reasons.append(TRADE_REASONS[code])
+            else:
+                reasons.append(_buy_reason(int(code)))
+
+        bars = out_bar[:k]
+        return pd.DataFrame({
+            "bar": bars,
+            "type": np.where(out_kind[:k] == strategy_fast.KIND_BUY, "BUY", "SELL"),
+            "reason": reasons,
+            "timestamp": df.index[bars],
+            "price": out_price[:k],
+            "entry_price": out_entry[:k],
+            "bars_held": out_bars_held[:k],
+            "ts_armed": out_armed[:k],
+        })
+
+    @classmethod
+    def _fast_params(cls, params: dict) -> dict:
+        """run_fast 파라미터 검증 + 클래스 기본값 채우기"""
+        unknown = set(params) - set(cls._FAST_PARAMS)
+        if unknown:
+            raise ValueError(f"run_fast: 알 수 없는 파라미터 {sorted(unknown)}")
+        p = {k: params.get(k, getattr(cls, k, None)) for k in cls._FAST_PARAMS}
+        if p["trailing_stop_pct"] is None:
+            p["trailing_stop_pct"] = TRAILING_STOP_PERCENT
+        return p
+
+    @classmethod
+    def _fast_conditions(cls, conditions: dict | None, user_id: str | None) -> dict:
+        """conditions 미지정 시 user_id(없으면 클래스 user_id)의 컨디션 파일 → 없으면 기본값"""
+        if conditions is not None:
+            return conditions
+        uid = user_id or getattr(cls, "user_id", "UNKNOWN")
+        path = _make_conditions_path(cls, uid)
+        return cls._read_conditions(path) if path.exists() else _DEFAULT_CONDITIONS
+
+    @classmethod
+    def run_fast_grid(cls, df: pd.DataFrame, grid, conditions: dict | None = None,
+                      user_id: str | None = None, max_workers: int | None = None) -> list:
+        """
+        파라미터 조합별 run_fast() 를 스레드 풀로 동시에 실행 (그리드 탐색용).
+        - 커널(strategy_fast.macd_backtest_kernel)은 nogil 컴파일 → numba 설치 시 코어 수만큼 병렬
+          (numba 미설치 시 결과는 같고 병렬 이득만 없음)
+        - grid: run_fast 키워드 파라미터 dict 시퀀스 (잘못된 키는 실행 전에 ValueError)
+        - 컨디션은 1회만 해석해서 모든 조합에 공유
+        - max_workers 미지정 시 min(조합 수, CPU 수), 1 이면 순차 실행
+
+        반환: grid 순서와 같은 트레이드 DataFrame 리스트
+        """
+        grid = [dict(params) for params in grid]
+        for params in grid:
+            cls._fast_params(params)
+        conditions = cls._fast_conditions(conditions, user_id)
+
+        def run(params):
+            return cls.run_fast(df, conditions=conditions, **params)
+
+        workers = max_workers or min(len(grid), os.cpu_count() or 1)
+        if workers <= 1:
+            return [run(params) for params in grid]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, grid))
 
     # Audit
-    def _buy_checks_report(self, state, buy_cond):
+    def _buy_checks_report(self, state):
         eps = 1e-8
+        idx = self._bar_idx
         report = {}
 
         def add(name, enabled, passed, raw=None):
             report[name] = {"enabled": 1 if enabled else 0, "pass": 1 if passed else 0, "value": raw}
 
-        golden = self._is_golden_cross()
-        macd_pos_cross = self._is_macd_cross_up(self.macd_threshold)
-        signal_pos_cross = self._is_signal_cross_up(self.macd_threshold)
-        bull = self._is_bullish_candle()
-        trending = self._is_macd_trending_up()
-        above20 = self._is_above_ma20()
-        above60 = self._is_above_ma60()
-
-        add("golden_cross",     buy_cond.get("golden_cross", False),        golden,             {"macd":state["macd"], "signal":state["signal"]})
-        add("macd_positive",    buy_cond.get("macd_positive", False),       macd_pos_cross,     {"macd":state["macd"], "thr":self.macd_threshold})
-        add("signal_positive",  buy_cond.get("signal_positive", False),     signal_pos_cross,   {"signal":state["signal"], "thr":self.macd_threshold})
-        add("bullish_candle",   buy_cond.get("bullish_candle", False),      bull,               {"open":float(self.data.Open[-1]), "close":state["price"]})
-        add("macd_trending_up", buy_cond.get("macd_trending_up", False),    trending,           None)
-        add("above_ma20",       buy_cond.get("above_ma20", False),          above20,            {"ma20": float(self.ma20[-1])})
-        add("above_ma60",       buy_cond.get("above_ma60", False),          above60,            {"ma60": float(self.ma60[-1])})
+        golden, macd_pos_cross, signal_pos_cross, bull, trending, above20, above60 = (
+            bool(arr[idx]) for _, arr in self._buy_check_arrays
+        )
+
+        add("golden_cross",     self._c_golden,                             golden,             {"macd":state.macd, "signal":state.signal})
+        add("macd_positive",    self._c_macd_pos,                           macd_pos_cross,     {"macd":state.macd, "thr":self.macd_threshold})
+        add("signal_positive",  self._c_signal_pos,                         signal_pos_cross,   {"signal":state.signal, "thr":self.macd_threshold})
+        open_, ma20, ma60 = self._report_vals[idx]
+        add("bullish_candle",   self._c_bullish,                            bull,               {"open":open_, "close":state.price})
+        add("macd_trending_up", self._c_trend_up,                           trending,           None)
+        add("above_ma20",       self._c_above20,                            above20,            {"ma20": ma20})
+        add("above_ma60",       self._c_above60,                            above60,            {"ma60": ma60})
 
         if self.signal_confirm_enabled:
-            gate_ok = self._is_signal_cross_up(self.macd_threshold)
-            report["signal_confirm"] = {"enabled":1, "pass": 1 if gate_ok else 0, "value":{"signal":state["signal"], "thr":self.macd_threshold}}
+            gate_ok = bool(self._signal_up[idx])
+            report["signal_confirm"] = {"enabled":1, "pass": 1 if gate_ok else 0, "value":{"signal":state.signal, "thr":self.macd_threshold}}
 
         enabled_keys = [k for k,v in report.items() if v["enabled"]==1]
         failed_keys  = [k for k in enabled_keys if report[k]["pass"]==0]
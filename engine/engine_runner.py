@@ -19,7 +19,7 @@ from services.db import (
     insert_log,
 )
 from config import MIN_FEE_RATIO, PARAMS_JSON_FILENAME, DEFAULT_USER_ID
-from utils.logging_util import log_to_file
+from utils.logging_util import log_to_file, enable_queue_logging
 
 
 logging.basicConfig(
@@ -27,6 +27,8 @@ logging.basicConfig(
     format="%(asctime)s %(levelname)s %(name)s | %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
+# ✅ 로그 출력(I/O)은 백그라운드 리스너 스레드로 → 엔진 봉 루프는 enqueue 만
+enable_queue_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -1163,6 +1163,137 @@ def insert_sell_eval(
         conn.commit()
 
 
+
+def _audit_json(v):
+    return json.dumps(v, ensure_ascii=False) if v else None
+
+
+def _upsert_audit_rows(user_id: str, table: str, rows: list[dict], update_sql: str, insert_sql: str,
+                       update_params, insert_params) -> int:
+    """
+    감사로그 일괄 UPSERT 공통부
+    - 같은 (ticker, bar_time) 은 마지막 행만 남김 (순차 UPSERT 결과와 동일)
+    - 기존 id 조회 후 UPDATE/INSERT 를 executemany 로 나눠 한 트랜잭션에서 처리
+    """
+    latest = {}
+    for r in rows:
+        if r.get("bar_time") is None:
+            raise ValueError(f"bar_time is required for {table}")
+        latest[(r["ticker"], r["bar_time"])] = r
+
+    timestamp_now = now_kst()
+    updates, inserts = [], []
+
+    with get_db(user_id) as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            for (ticker, bar_time), r in latest.items():
+                cur.execute(
+                    f"SELECT id FROM {table} WHERE ticker=? AND bar_time=?",
+                    (ticker, bar_time)
+                )
+                existing = cur.fetchone()
+                if existing:
+                    updates.append(update_params(timestamp_now, r) + (existing[0],))
+                else:
+                    inserts.append(insert_params(timestamp_now, r))
+            if updates:
+                cur.executemany(update_sql, updates)
+            if inserts:
+                cur.executemany(insert_sql, inserts)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    if updates:
+        import logging
+        logging.getLogger(__name__).info(
+            f"[AUDIT-UPDATE] {table} 일괄 UPDATE {len(updates)}건 / INSERT {len(inserts)}건"
+        )
+    return len(latest)
+
+
+def insert_buy_evals_many(user_id: str, rows: list[dict]) -> int:
+    """
+    BUY 평가 감사로그 일괄 기록 (insert_buy_eval 과 같은 UPSERT 규칙)
+    - rows: insert_buy_eval 키워드 인자 dict 목록 (user_id 제외)
+    - 봉마다 연결/커밋하던 왕복을 한 커넥션·한 트랜잭션으로 묶음
+    - bar_time 이 없는 행이 하나라도 있으면 아무것도 기록하지 않고 ValueError
+    - 반환: 반영된 (ticker, bar_time) 수
+    """
+    if not rows:
+        return 0
+
+    def _common(r):
+        return (
+            r["price"], r["macd"], r["signal"],
+            int(bool(r["have_position"])), int(bool(r["overall_ok"])),
+            _audit_json(r.get("failed_keys")), _audit_json(r.get("checks")),
+            r.get("notes", ""),
+        )
+
+    return _upsert_audit_rows(
+        user_id, "audit_buy_eval", rows,
+        """
+        UPDATE audit_buy_eval
+        SET timestamp=?, interval_sec=?, bar=?, price=?, macd=?, signal=?,
+            have_position=?, overall_ok=?, failed_keys=?, checks=?, notes=?
+        WHERE id=?
+        """,
+        """
+        INSERT INTO audit_buy_eval
+        (timestamp, bar_time, ticker, interval_sec, bar, price, macd, signal,
+         have_position, overall_ok, failed_keys, checks, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        lambda ts, r: (ts, r["interval_sec"], r["bar"]) + _common(r),
+        lambda ts, r: (ts, r["bar_time"], r["ticker"], r["interval_sec"], r["bar"]) + _common(r),
+    )
+
+
+def insert_sell_evals_many(user_id: str, rows: list[dict]) -> int:
+    """
+    SELL 평가 감사로그 일괄 기록 (insert_sell_eval 과 같은 UPSERT 규칙)
+    - rows: insert_sell_eval 키워드 인자 dict 목록 (user_id 제외)
+    - 봉마다 연결/커밋하던 왕복을 한 커넥션·한 트랜잭션으로 묶음
+    - bar_time 이 없는 행이 하나라도 있으면 아무것도 기록하지 않고 ValueError
+    - 반환: 반영된 (ticker, bar_time) 수
+    """
+    if not rows:
+        return 0
+
+    def _common(r):
+        return (
+            r["price"], r["macd"], r["signal"],
+            r["tp_price"], r["sl_price"], r.get("highest"), r.get("ts_pct"),
+            int(bool(r["ts_armed"])), r["bars_held"],
+            _audit_json(r.get("checks")),
+            int(bool(r["triggered"])), r.get("trigger_key"), r.get("notes", ""),
+        )
+
+    return _upsert_audit_rows(
+        user_id, "audit_sell_eval", rows,
+        """
+        UPDATE audit_sell_eval
+        SET timestamp=?, interval_sec=?, bar=?, price=?, macd=?, signal=?,
+            tp_price=?, sl_price=?, highest=?, ts_pct=?, ts_armed=?,
+            bars_held=?, checks=?, triggered=?, trigger_key=?, notes=?
+        WHERE id=?
+        """,
+        """
+        INSERT INTO audit_sell_eval
+        (timestamp, bar_time, ticker, interval_sec, bar, price, macd, signal,
+         tp_price, sl_price, highest, ts_pct, ts_armed, bars_held,
+         checks, triggered, trigger_key, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        lambda ts, r: (ts, r["interval_sec"], r["bar"]) + _common(r),
+        lambda ts, r: (ts, r["bar_time"], r["ticker"], r["interval_sec"], r["bar"]) + _common(r),
+    )
+
+
 def insert_trade_audit(
     user_id: str,
     ticker: str,
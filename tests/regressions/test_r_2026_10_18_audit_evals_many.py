@@ -0,0 +1,310 @@
+"""
+✅ 회귀: 감사로그 일괄 적재 (insert_buy_evals_many / insert_sell_evals_many) (2026-10-18)
+
+변경:
+- MACDStrategy 가 봉마다 insert_buy_eval/insert_sell_eval 로 DB 연결·커밋하던 것을
+  행 버퍼 → insert_*_evals_many 일괄 적재(한 커넥션·한 트랜잭션)로 교체.
+
+본 회귀는 임시 DB 에서
+- 일괄 적재 결과가 단건 insert_*_eval 을 순서대로 호출한 결과와 같은지
+  (같은 (ticker, bar_time) 재평가는 UPDATE, 배치 내 중복은 마지막 행 반영)
+- bar_time 이 빠진 행이 있으면 ValueError + 아무것도 기록되지 않는지
+- 실제 백테스트(감사 함수 mock 없음)에서 BUY/SELL 평가 행이 임시 DB 에 실제로 들어가고
+  bar_time 이 봉 시각(KST isoformat)으로 채워지며, dedup 세트가 적재된 행만큼 채워지는지
+- next() 예외 / 자금 소진(_OutOfMoneyError)으로 백테스트가 중간에 끝나도 버퍼에 남은 행이 적재되는지
+- 같은 실제 적재 경로에서 버퍼가 AUDIT_BATCH_ROWS 단위로 적재되고, SELL 트리거 행은 트리거가 난 봉에서
+  즉시(배치 마지막 행으로) DB 에 기록되며, 마지막 봉에서 남은 행이 모두 적재되는지
+확인.
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_audit_evals_many -v
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtesting import Backtest  # noqa: E402
+
+import core.strategy_v2 as sv  # noqa: E402
+from services import db  # noqa: E402
+from services.init_db import ensure_all_schemas  # noqa: E402
+
+
+BUY_COLS = "bar_time, ticker, interval_sec, bar, price, macd, signal, have_position, overall_ok, failed_keys, checks, notes"
+SELL_COLS = ("bar_time, ticker, interval_sec, bar, price, macd, signal, tp_price, sl_price, highest, ts_pct, "
+             "ts_armed, bars_held, checks, triggered, trigger_key, notes")
+
+
+def _buy_row(bar, bar_time, ok=False):
+    return dict(
+        ticker="KRW-TEST", interval_sec=60, bar=bar, price=100.0 + bar, macd=0.1, signal=0.05,
+        have_position=False, overall_ok=ok, failed_keys=[] if ok else ["golden_cross"],
+        checks={"golden_cross": {"enabled": 1, "pass": int(ok), "value": "골든"}},
+        notes="OK" if ok else "FAILED", bar_time=bar_time,
+    )
+
+
+def _sell_row(bar, bar_time, trigger=None):
+    return dict(
+        ticker="KRW-TEST", interval_sec=60, bar=bar, price=100.0 + bar, macd=0.1, signal=0.05,
+        tp_price=101.0, sl_price=99.0, highest=None, ts_pct=0.02, ts_armed=False, bars_held=bar,
+        checks={"stop_loss": {"enabled": 1, "pass": int(trigger is not None), "value": 99.0}},
+        triggered=trigger is not None, trigger_key=trigger, notes="", bar_time=bar_time,
+    )
+
+
+class TestAuditEvalsMany(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp(prefix="audit_many_"))
+        self.paths = {}
+        self.patchers = [
+            patch(f"{mod}.get_db_path", side_effect=lambda uid: self.paths.setdefault(
+                uid, str(self.tmpdir / f"tradebot_{uid}.db")))
+            for mod in ("services.init_db", "services.db")
+        ]
+        for p in self.patchers:
+            p.start()
+        for uid in ("single", "batch"):
+            ensure_all_schemas(uid)
+
+    def tearDown(self):
+        for p in self.patchers:
+            p.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _rows(self, uid, table, cols):
+        with sqlite3.connect(self.paths[uid]) as conn:
+            return conn.execute(f"SELECT {cols} FROM {table} ORDER BY bar_time").fetchall()
+
+    def test_buy_matches_single_inserts(self):
+        rows = [_buy_row(i, f"2026-01-01 00:0{i}:00") for i in range(5)]
+        rows.append(_buy_row(7, "2026-01-01 00:02:00", ok=True))   # 같은 봉 재평가 → UPDATE
+        db.insert_buy_evals_many("batch", rows[:3])
+        self.assertEqual(db.insert_buy_evals_many("batch", rows[3:]), 3)
+        for r in rows:
+            db.insert_buy_eval("single", **r)
+        self.assertEqual(len(self._rows("batch", "audit_buy_eval", BUY_COLS)), 5)
+        self.assertEqual(self._rows("batch", "audit_buy_eval", BUY_COLS),
+                         self._rows("single", "audit_buy_eval", BUY_COLS))
+
+    def test_sell_duplicate_in_batch_last_wins(self):
+        rows = [_sell_row(i, f"2026-01-01 00:0{i}:00") for i in range(3)]
+        rows.append(_sell_row(9, "2026-01-01 00:01:00", trigger="Stop Loss"))
+        self.assertEqual(db.insert_sell_evals_many("batch", rows), 3)
+        for r in rows:
+            db.insert_sell_eval("single", **r)
+        got = self._rows("batch", "audit_sell_eval", SELL_COLS)
+        self.assertEqual(got, self._rows("single", "audit_sell_eval", SELL_COLS))
+        self.assertEqual(got[1][-2], "Stop Loss")
+
+    def test_missing_bar_time_writes_nothing(self):
+        rows = [_buy_row(0, "2026-01-01 00:00:00"), _buy_row(1, None)]
+        with self.assertRaises(ValueError):
+            db.insert_buy_evals_many("batch", rows)
+        self.assertEqual(self._rows("batch", "audit_buy_eval", BUY_COLS), [])
+        self.assertEqual(db.insert_sell_evals_many("batch", []), 0)
+
+
+def _ohlc(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    return pd.DataFrame({
+        "Open": np.r_[close[0], close[:-1]], "High": close * 1.002, "Low": close * 0.998,
+        "Close": close, "Volume": 1.0,
+    }, index=pd.date_range("2026-01-01", periods=n, freq="min"))
+
+
+class _StrategyDBCase(unittest.TestCase):
+    """임시 DB + 컨디션 파일로 MACDStrategy 백테스트 (감사 적재 함수는 실제 구현 사용)"""
+
+    uid = "e2e"
+
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp(prefix="audit_e2e_"))
+        self.cwd = os.getcwd()
+        os.chdir(self.tmpdir)
+        self.db_path = str(self.tmpdir / f"tradebot_{self.uid}.db")
+        self.patchers = [
+            patch(f"{mod}.get_db_path", return_value=self.db_path)
+            for mod in ("services.init_db", "services.db")
+        ]
+        for p in self.patchers:
+            p.start()
+        ensure_all_schemas(self.uid)
+        sv.MACDStrategy._seen_buy_audits = set()
+        sv.MACDStrategy._seen_sell_audits = set()
+        conditions = {
+            "buy": {k: k == "golden_cross" for k in sv._BUY_KEYS},
+            "sell": {k: k in ("take_profit", "stop_loss") for k in sv._SELL_KEYS},
+        }
+        Path(sv._make_conditions_path(sv.MACDStrategy, self.uid)).write_text(json.dumps(conditions))
+        self.cls = type("AuditMACD", (sv.MACDStrategy,), dict(
+            user_id=self.uid, ticker="KRW-TEST", take_profit=0.005, stop_loss=0.005,
+        ))
+
+    def tearDown(self):
+        for p in self.patchers:
+            p.stop()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _run(self, df, cls=None):
+        return Backtest(df, cls or self.cls, cash=1e7, commission=0.0005, exclusive_orders=True).run()
+
+    def _db_rows(self, sql):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql).fetchall()
+
+
+class TestStrategyAuditEndToEnd(_StrategyDBCase):
+
+    def test_rows_land_in_db(self):
+        df = _ohlc(1500, seed=5)
+        with self.assertNoLogs(sv.logger, level="ERROR"):
+            self._run(df)
+
+        buy = self._db_rows("SELECT bar_time, bar FROM audit_buy_eval ORDER BY bar_time")
+        sell = self._db_rows("SELECT bar_time, triggered FROM audit_sell_eval ORDER BY bar_time")
+        self.assertGreater(len(buy), 0)
+        self.assertGreater(len(sell), 0)
+        self.assertEqual(len(buy), len(sv.MACDStrategy._seen_buy_audits))
+
+        bar_times = set(df.index.tz_localize("Asia/Seoul").map(lambda t: t.isoformat()))
+        self.assertTrue({bt for bt, _ in buy} <= bar_times)
+        self.assertTrue({bt for bt, _ in sell} <= bar_times)
+        self.assertEqual(buy[0][0], "2026-01-01T01:00:00+09:00")   # 워밍업 60봉 이후 첫 평가 봉
+
+        n_sells = sum(e["type"] == "SELL" for e in sv.MACDStrategy.trade_events)
+        self.assertGreater(n_sells, 0)
+        self.assertEqual(sum(t for _, t in sell), n_sells)
+
+
+class TestStrategyAuditEarlyStop(_StrategyDBCase):
+    """마지막 봉에 도달하지 못하고 끝나는 실행에서도 버퍼가 비워지는지"""
+
+    STOP = 200   # 워밍업(60봉) 이후 141봉 평가 → AUDIT_BATCH_ROWS 배수가 아닌 잔여 행이 남음
+
+    def setUp(self):
+        super().setUp()
+        # 켜진 조건 없음 → 매수 없이 매 봉 BUY 평가 행(NO_ENABLED_CONDITIONS) 1건씩
+        conditions = {"buy": {k: False for k in sv._BUY_KEYS}, "sell": {k: False for k in sv._SELL_KEYS}}
+        Path(sv._make_conditions_path(sv.MACDStrategy, self.uid)).write_text(json.dumps(conditions))
+        self.expected = self.STOP - 60 + 1
+        self.assertNotEqual(self.expected % sv.AUDIT_BATCH_ROWS, 0)
+
+    def _buy_rows(self):
+        return self._db_rows("SELECT COUNT(*) FROM audit_buy_eval")[0][0]
+
+    def test_exception_in_next(self):
+        stop = self.STOP
+
+        class Failing(self.cls):
+            # next() 내부(평가 도중) 예외 → 이번 봉 BUY 평가 전에 중단
+            def _update_cross_state(self, state):
+                super()._update_cross_state(state)
+                if self._bar_idx == stop:
+                    raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self._run(_ohlc(400, seed=9), Failing)
+        self.assertEqual(self._buy_rows(), self.expected - 1)
+
+    def test_out_of_money(self):
+        stop = self.STOP
+
+        class Broke(self.cls):
+            def next(self):
+                super().next()
+                if len(self.data) - 1 == stop:
+                    self._broker._cash = -1.0   # 다음 broker.next() 에서 _OutOfMoneyError → 루프 중단
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)   # 잔고 0 → 통계 계산의 log(0) 경고
+            stats = self._run(_ohlc(400, seed=9), Broke)
+        self.assertEqual(stats["Equity Final [$]"], 0)
+        self.assertEqual(self._buy_rows(), self.expected)
+
+
+class TestStrategyAuditFlush(_StrategyDBCase):
+    """적재 시점 (실제 insert_*_evals_many 를 감싼 spy 로 호출 시점/배치만 기록)"""
+
+    def setUp(self):
+        super().setUp()
+        self.batches = {"buy": [], "sell": []}
+        self.bar = [None]   # 현재 next() 처리 중인 봉 인덱스
+
+        def spy(kind, real):
+            def insert(uid, rows):
+                n = real(uid, rows)
+                self.batches[kind].append((self.bar[0], list(rows)))
+                return n
+            return insert
+
+        self.spies = [
+            patch.object(sv, "insert_buy_evals_many", spy("buy", db.insert_buy_evals_many)),
+            patch.object(sv, "insert_sell_evals_many", spy("sell", db.insert_sell_evals_many)),
+        ]
+        for p in self.spies:
+            p.start()
+
+    def tearDown(self):
+        for p in self.spies:
+            p.stop()
+        super().tearDown()
+
+    def test_flush_points(self):
+        df = _ohlc(1500, seed=5)
+        bar = self.bar
+
+        class Tracked(self.cls):
+            def next(self):
+                bar[0] = len(self.data) - 1
+                super().next()
+
+        self._run(df, Tracked)
+        bar_times = [t.isoformat() for t in df.index.tz_localize("Asia/Seoul")]
+
+        n_sell_trades = sum(e["type"] == "SELL" for e in sv.MACDStrategy.trade_events)
+        self.assertGreater(n_sell_trades, 0)
+        n_triggered = 0
+        for at_bar, batch in self.batches["sell"]:
+            self.assertLessEqual(len(batch), sv.AUDIT_BATCH_ROWS)
+            # 트리거 행은 들어온 즉시 적재 → 배치 중간에 끼지 않고, 트리거가 난 봉에서 바로 기록됨
+            self.assertFalse(any(r["triggered"] for r in batch[:-1]))
+            if batch[-1]["triggered"]:
+                n_triggered += 1
+                self.assertEqual(batch[-1]["bar_time"], bar_times[at_bar])
+        self.assertEqual(n_triggered, n_sell_trades)
+        stored = self._db_rows("SELECT bar_time FROM audit_sell_eval WHERE triggered=1 ORDER BY bar_time")
+        self.assertEqual(
+            [bt for (bt,) in stored],
+            sorted(b[-1]["bar_time"] for _, b in self.batches["sell"] if b[-1]["triggered"]),
+        )
+
+        for _, batch in self.batches["buy"]:
+            self.assertLessEqual(len(batch), sv.AUDIT_BATCH_ROWS)
+        # 마지막 봉에서 남은 행까지 적재 → DB 행 수 = 넘긴 행 수 = dedup 세트 크기
+        self.assertEqual(self.batches["buy"][-1][0], len(df) - 1)
+        n_buy = sum(len(b) for _, b in self.batches["buy"])
+        self.assertEqual(self._db_rows("SELECT COUNT(*) FROM audit_buy_eval")[0][0], n_buy)
+        self.assertEqual(n_buy, len(sv.MACDStrategy._seen_buy_audits))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+✅ 회귀: 컨디션 핫리로드 stat 주기 게이트 (CONDITIONS_RELOAD_EVERY_BARS) (2026-10-18)
+
+변경:
+- MACDStrategy._maybe_reload_conditions 가 매 봉 컨디션 파일을 stat 하던 것을
+  N 봉마다(CONDITIONS_RELOAD_EVERY_BARS) + 마지막 봉에서만 확인하도록 변경.
+
+본 회귀는 백테스트 도중 컨디션 파일을 바꿨을 때
+- 다음 N 배수 봉에서 반영되고, 그 사이 봉에서는 이전 컨디션이 유지되는지
+- 마지막 봉은 주기와 무관하게 항상 확인되는지 (라이브 루프의 실시간 봉)
+확인. 감사 DB/주문 게이트는 mock 으로 대체.
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_conditions_reload_gate -v
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtesting import Backtest  # noqa: E402
+
+import core.strategy_v2 as sv  # noqa: E402
+
+
+def _conditions(golden):
+    return {
+        "buy": {k: golden and k == "golden_cross" for k in sv._BUY_KEYS},
+        "sell": {k: k == "stop_loss" for k in sv._SELL_KEYS},
+    }
+
+
+class TestConditionsReloadGate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="reload_gate_")
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.patches = [
+            mock.patch.object(sv, "insert_buy_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "insert_sell_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "has_open_by_orders", lambda *a, **kw: False),
+            mock.patch.object(sv, "CONDITIONS_RELOAD_EVERY_BARS", 100),
+        ]
+        for p in self.patches:
+            p.start()
+        sv.MACDStrategy._seen_buy_audits = set()
+        sv.MACDStrategy._seen_sell_audits = set()
+
+        rng = np.random.default_rng(7)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, 450)))
+        self.df = pd.DataFrame({
+            "Open": np.r_[close[0], close[:-1]], "High": close * 1.002, "Low": close * 0.998,
+            "Close": close, "Volume": 1.0,
+        }, index=pd.date_range("2026-01-01", periods=len(close), freq="min"))
+        self.path = Path(sv._make_conditions_path(sv.MACDStrategy, "reload"))
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        os.chdir(self.cwd)
+
+    def _run(self, change_at):
+        """change_at 봉에서 컨디션 파일을 교체하고, 봉별 golden_cross 활성 여부를 기록."""
+        self.path.write_text(json.dumps(_conditions(False)))
+        seen = {}
+        path = self.path
+
+        class Probe(sv.MACDStrategy):
+            user_id = "reload"
+            ticker = "KRW-TEST"
+
+            def next(self):
+                i = len(self.data) - 1
+                if i == change_at:
+                    path.write_text(json.dumps(_conditions(True)))
+                    st = path.stat()
+                    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+                super().next()
+                seen[i] = bool(self.conditions["buy"]["golden_cross"])
+
+        Backtest(self.df, Probe, cash=1e7, commission=0.0005, exclusive_orders=True).run()
+        return seen
+
+    def test_applied_on_next_multiple(self):
+        seen = self._run(change_at=130)
+        self.assertFalse(seen[130])
+        self.assertFalse(seen[199])
+        self.assertTrue(seen[200])
+        self.assertTrue(seen[449])
+
+    def test_last_bar_always_checked(self):
+        seen = self._run(change_at=420)
+        self.assertFalse(seen[448])
+        self.assertTrue(seen[449])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+✅ 회귀: 엔트리 기준 캐시(TP/SL 가격, 최소 보유 봉)가 엔트리 설정 경로와 무관하게 동기화 (2026-10-18)
+
+배경:
+- _evaluate_sell 은 매 봉 TP/SL 을 재계산하지 않고 엔트리 설정 시 계산해 둔
+  _tp_price/_sl_price/_min_sell_bar 를 그대로 읽는다.
+- 캐시가 _evaluate_buy/엔트리 복구 경로에서만 갱신되면, 다른 경로(외부 동기화, 직접 buy 후 엔트리 지정)로
+  entry_price 가 바뀌었을 때 price >= None 으로 TypeError 가 나거나 이전 엔트리 기준으로 매도한다.
+  → entry_price/entry_bar 세터에서 캐시를 갱신.
+
+본 회귀는 _evaluate_buy 를 거치지 않고 self.buy() 로 진입한 뒤 엔트리를 외부에서 지정하는 백테스트에서
+- entry_price 만 지정해도 SELL 평가가 예외 없이 돌고, TP/SL 이 지정한 엔트리 기준인지
+- 보유 중 entry_price 를 바꾸면 이후 SELL 의 TP/SL 이 새 엔트리 기준인지
+- entry_bar 지정 시 최소 보유 봉(entry_bar + min_holding_period)이 갱신되어 TS 매도가 그 이후에만 나는지
+- 매도 후 _reset_entry 로 캐시까지 비워지는지
+확인. 감사 DB/주문 게이트는 mock 으로 대체.
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_macd_entry_cache -v
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtesting import Backtest  # noqa: E402
+
+import core.strategy_v2 as sv  # noqa: E402
+
+BUY_AT = 100   # self.buy() 호출 봉 (체결은 다음 봉 시가)
+
+
+def _ohlc(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    idx = pd.date_range("2026-01-01", periods=n, freq="min")
+    return pd.DataFrame({
+        "Open": np.r_[close[0], close[:-1]], "High": close * 1.002, "Low": close * 0.998,
+        "Close": close, "Volume": 1.0,
+    }, index=idx)
+
+
+class _ExternalEntryCase(unittest.TestCase):
+    """BUY 조건 전부 OFF(전략 매수 없음) + 외부 self.buy() 로 1회 진입"""
+
+    sell_keys = ()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="entry_cache_")
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.patches = [
+            mock.patch.object(sv, "insert_buy_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "insert_sell_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "has_open_by_orders", lambda *a, **kw: False),
+        ]
+        for p in self.patches:
+            p.start()
+        sv.MACDStrategy._seen_buy_audits = set()
+        sv.MACDStrategy._seen_sell_audits = set()
+
+        uid = "entrycache"
+        conditions = {
+            "buy": {k: False for k in sv._BUY_KEYS},
+            "sell": {k: k in self.sell_keys for k in sv._SELL_KEYS},
+        }
+        Path(sv._make_conditions_path(sv.MACDStrategy, uid)).write_text(json.dumps(conditions))
+        self.base = type("EntryCacheMACD", (sv.MACDStrategy,), dict(
+            user_id=uid, ticker="KRW-TEST", take_profit=0.005, stop_loss=0.01, min_holding_period=5,
+        ))
+        self.df = _ohlc()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        os.chdir(self.cwd)
+
+    def _run(self, on_entry):
+        """BUY_AT 에서 직접 buy → 체결 봉부터 on_entry(strategy, i) 로 엔트리를 외부에서 지정"""
+        class External(self.base):
+            def next(self):
+                i = len(self.data) - 1
+                if i == BUY_AT:
+                    self.buy()
+                elif self.position.size > 0:
+                    on_entry(self, i)
+                super().next()
+
+        stats = Backtest(self.df, External, cash=1e7, commission=0.0005, exclusive_orders=True).run()
+        sells = [e for e in sv.MACDStrategy.trade_events if e["type"] == "SELL"]
+        return stats._strategy, sells
+
+
+class TestExternalEntryPrice(_ExternalEntryCase):
+
+    sell_keys = ("take_profit", "stop_loss")
+
+    def test_entry_price_only(self):
+        entry = {}
+
+        def on_entry(st, i):
+            if i == BUY_AT + 1:
+                entry["price"] = float(st.data.Open[-1])
+                st.entry_price = entry["price"]
+
+        _, sells = self._run(on_entry)
+        self.assertEqual(len(sells), 1)
+        self.assertEqual(sells[0]["entry_price"], entry["price"])
+        self.assertAlmostEqual(sells[0]["tp"], entry["price"] * 1.005)
+        self.assertAlmostEqual(sells[0]["sl"], entry["price"] * 0.99)
+
+    def test_entry_price_changed_in_position(self):
+        entry = {}
+
+        def on_entry(st, i):
+            if i == BUY_AT + 1:
+                st.entry_price = float(st.data.Open[-1])
+            elif i == BUY_AT + 3:
+                entry["price"] = st.entry_price * 0.98   # 외부 평단 동기화
+                st.entry_price = entry["price"]
+
+        _, sells = self._run(on_entry)
+        self.assertEqual(len(sells), 1)
+        self.assertEqual(sells[0]["entry_price"], entry["price"])
+        self.assertAlmostEqual(sells[0]["tp"], entry["price"] * 1.005)
+        self.assertAlmostEqual(sells[0]["sl"], entry["price"] * 0.99)
+
+
+class TestExternalEntryBar(_ExternalEntryCase):
+
+    sell_keys = ("take_profit", "trailing_stop")
+
+    def test_min_sell_bar_follows_entry_bar(self):
+        seen = {}
+
+        def on_entry(st, i):
+            if i == BUY_AT + 1:
+                st.entry_price = float(st.data.Open[-1])
+                st.entry_bar = st._bar_counter + 1   # 이번 봉의 state.bar
+                seen["entry_bar"] = st.entry_bar
+                seen["min_sell_bar"] = st._min_sell_bar
+
+        st, sells = self._run(on_entry)
+        self.assertEqual(seen["min_sell_bar"], seen["entry_bar"] + st.min_holding_period)
+        self.assertEqual([e["reason"] for e in sells], ["Trailing Stop"])
+        self.assertGreaterEqual(sells[0]["bars_held"], st.min_holding_period)
+
+        # 매도 후 엔트리 초기화 → 캐시도 함께 비워짐
+        self.assertIsNone(st.entry_price)
+        self.assertIsNone(st._tp_price)
+        self.assertIsNone(st._sl_price)
+        self.assertIsNone(st._min_sell_bar)
+
+
+if __name__ == "__main__":
+    unittest.main()
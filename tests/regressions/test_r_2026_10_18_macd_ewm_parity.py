@@ -0,0 +1,78 @@
+"""
+✅ 회귀: MACD EMA 재귀식 ↔ pandas ewm(adjust=False) 비트 단위 일치 (2026-10-18)
+
+배경:
+- MACDStrategy 지표(MACD/Signal) 계산이 pandas ewm 대신
+  core/strategy_fast.ewm_mean (numba 설치 시 JIT) 을 사용하도록 변경.
+- 값이 조금이라도 달라지면 골든/데드 크로스 EPS 판정이 바뀌어 기존 백테스트와 어긋난다.
+
+본 회귀는 선행 NaN / 중간 NaN 구간을 포함한 시계열에서
+_ewm_span 결과가 pandas 와 완전히 같은지, 그리고 지표 일괄 계산(_macd_indicators)이
+numba 커널/폴백 경로 모두 pandas ewm/rolling 결과와 같은지 확인 (NaN 위치 포함).
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_macd_ewm_parity -v
+"""
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+import core.strategy_v2 as sv  # noqa: E402
+from core.strategy_v2 import _ewm_span  # noqa: E402
+
+
+def _pandas_ewm(x, span):
+    return pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+class TestEwmParity(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.x = 100 + np.cumsum(rng.normal(0, 0.5, 5000))
+
+    def test_plain_series(self):
+        for span in (9, 12, 26):
+            np.testing.assert_array_equal(_ewm_span(self.x, span), _pandas_ewm(self.x, span))
+
+    def test_nan_gaps(self):
+        x = self.x.copy()
+        x[:3] = np.nan          # 선행 NaN (MACD → Signal 입력과 같은 모양)
+        x[[100, 101, 2500]] = np.nan
+        for span in (9, 12, 26):
+            np.testing.assert_array_equal(_ewm_span(x, span), _pandas_ewm(x, span))
+
+    def test_fused_indicators(self):
+        close = self.x.copy()
+        close[[100, 2500]] = np.nan
+        high, low = close * 1.01, close * 0.99
+
+        macd = _pandas_ewm(close, 12) - _pandas_ewm(close, 26)
+        expected = (
+            macd,
+            _pandas_ewm(macd, 9),
+            pd.Series(close).rolling(20).mean().to_numpy(),
+            pd.Series(close).rolling(60).mean().to_numpy(),
+            pd.Series(high - low).rolling(20).mean().to_numpy(),
+        )
+        for numba_on in (True, False):
+            with self.subTest(numba=numba_on), mock.patch.object(sv, "NUMBA_AVAILABLE", numba_on):
+                got = sv._macd_indicators(close, high, low, 12, 26, 9, 20)
+                np.testing.assert_array_equal(got[0], expected[0])
+                np.testing.assert_array_equal(got[1], expected[1])
+                # MA 는 누적합 차분 → pandas rolling 과 ULP 수준 차이만 허용
+                for g, e in zip(got[2:], expected[2:]):
+                    np.testing.assert_allclose(g, e, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
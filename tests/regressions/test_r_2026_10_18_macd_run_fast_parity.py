@@ -0,0 +1,128 @@
+"""
+✅ 회귀: MACDStrategy.run_fast() ↔ Backtest.run() 트레이드 일치 (2026-10-18)
+
+배경:
+- 파라미터 그리드 탐색용으로 backtesting.py 루프 없이 단일 커널(core/strategy_fast.py)로
+  매수/매도 상태머신을 실행하는 MACDStrategy.run_fast() 추가.
+- 판정 규칙(크로스 EPS, TP→TS ARM, 트리거 우선순위, 최소 보유, 다음 봉 체결)이
+  MACDStrategy 와 어긋나면 그리드 탐색 결과가 실제 전략과 달라진다.
+
+본 회귀는 합성 시계열 + 여러 컨디션 조합에서 Backtest 로 돌린 trade_events 와
+run_fast() 결과의 (type, reason, timestamp, price, bars_held) 가 완전히 같은지 확인.
+run_fast_grid() (스레드 병렬) 결과가 조합별 run_fast() 순차 실행과 같은지도 확인.
+감사 DB/주문 게이트는 mock 으로 대체.
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_macd_run_fast_parity -v
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtesting import Backtest  # noqa: E402
+
+import core.strategy_v2 as sv  # noqa: E402
+
+
+CASES = [
+    ({"golden_cross"}, {"take_profit", "stop_loss"}),
+    ({"golden_cross", "above_ma20"}, {"take_profit", "stop_loss", "trailing_stop"}),
+    ({"macd_positive"}, {"dead_cross", "stop_loss"}),
+    ({"signal_positive", "bullish_candle"}, {"macd_negative", "signal_negative"}),
+    ({"macd_trending_up", "above_ma60"}, {"take_profit", "trailing_stop", "stop_loss", "dead_cross"}),
+]
+
+
+def _ohlc(n=1500, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.001, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, n)))
+    idx = pd.date_range("2026-01-01", periods=n, freq="min")
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": 1.0}, index=idx)
+
+
+class TestRunFastParity(unittest.TestCase):
+
+    def setUp(self):
+        self.df = _ohlc()
+        self.tmp = tempfile.mkdtemp(prefix="run_fast_")
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.patches = [
+            mock.patch.object(sv, "insert_buy_eval", lambda **kw: None),
+            mock.patch.object(sv, "insert_sell_eval", lambda **kw: None),
+            mock.patch.object(sv, "insert_buy_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "insert_sell_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "has_open_by_orders", lambda *a, **kw: False),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        os.chdir(self.cwd)
+
+    def _strategy_cls(self, uid, buy, sell):
+        conditions = {
+            "buy": {k: k in buy for k in sv._BUY_KEYS},
+            "sell": {k: k in sell for k in sv._SELL_KEYS},
+        }
+        Path(sv._make_conditions_path(sv.MACDStrategy, uid)).write_text(json.dumps(conditions))
+        return type("ParityMACD", (sv.MACDStrategy,), dict(
+            user_id=uid, ticker="KRW-TEST", take_profit=0.01, stop_loss=0.01, min_holding_period=2,
+        ))
+
+    def test_trades_match_backtest(self):
+        for i, (buy, sell) in enumerate(CASES):
+            with self.subTest(buy=sorted(buy), sell=sorted(sell)):
+                uid = f"parity{i}"
+                cls = self._strategy_cls(uid, buy, sell)
+                sv.MACDStrategy._seen_buy_audits = set()
+                sv.MACDStrategy._seen_sell_audits = set()
+                Backtest(self.df, cls, cash=1e7, commission=0.0005, exclusive_orders=True).run()
+
+                expected = [
+                    (e["type"], e["reason"], e["timestamp"], e["price"], e["bars_held"])
+                    for e in sv.MACDStrategy.trade_events
+                ]
+                fast = cls.run_fast(self.df)
+                actual = list(zip(fast["type"], fast["reason"], fast["timestamp"], fast["price"], fast["bars_held"]))
+
+                self.assertGreater(len(expected), 0)
+                self.assertEqual(actual, expected)
+
+    def test_unknown_param_rejected(self):
+        with self.assertRaises(ValueError):
+            sv.MACDStrategy.run_fast(self.df, conditions={}, fast=5)
+
+    def test_grid_matches_sequential(self):
+        cls = self._strategy_cls("grid", *CASES[4])
+        grid = [
+            dict(fast_period=f, slow_period=sl, take_profit=tp)
+            for f in (8, 12) for sl in (21, 26) for tp in (0.005, 0.01)
+        ]
+        results = cls.run_fast_grid(self.df, grid, max_workers=4)
+        self.assertEqual(len(results), len(grid))
+        for params, got in zip(grid, results):
+            pd.testing.assert_frame_equal(got, cls.run_fast(self.df, **params))
+        with self.assertRaises(ValueError):
+            cls.run_fast_grid(self.df, [dict(fast_period=8), dict(fast=5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
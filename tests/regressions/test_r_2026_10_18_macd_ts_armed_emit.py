@@ -0,0 +1,109 @@
+"""
+✅ 회귀: SELL 트레이드 이벤트의 ts_armed 가 매도 시점 상태와 일치 (2026-10-18)
+
+배경:
+- 트레일링 스탑 ARM 상태는 trailing_armed 단일 속성으로만 관리되어야 한다.
+  (이름이 갈라지면 _emit_trade 가 항상 False 를 기록 → 리포트에서 TS 매도 구분 불가)
+- _sell_action 은 _emit_trade → _reset_entry 순서를 지켜야 매도 시점 ARM 상태가 남는다.
+
+본 회귀는 TP+TS+SL 조합 백테스트에서
+- 모든 'Trailing Stop' 매도는 ts_armed=True 이고 highest 가 기록되는지
+- SELL 이벤트의 ts_armed 시퀀스가 독립 구현(run_fast 커널)과 같은지
+- 매도 후 다음 BUY 이벤트의 ts_armed 는 False 로 초기화되는지
+확인. 감사 DB/주문 게이트는 mock 으로 대체.
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_macd_ts_armed_emit -v
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtesting import Backtest  # noqa: E402
+
+import core.strategy_v2 as sv  # noqa: E402
+
+
+def _ohlc(n=2000, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.001, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, n)))
+    idx = pd.date_range("2026-01-01", periods=n, freq="min")
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": 1.0}, index=idx)
+
+
+class TestTsArmedEmit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="ts_armed_")
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.patches = [
+            mock.patch.object(sv, "insert_buy_eval", lambda **kw: None),
+            mock.patch.object(sv, "insert_sell_eval", lambda **kw: None),
+            mock.patch.object(sv, "insert_buy_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "insert_sell_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "has_open_by_orders", lambda *a, **kw: False),
+        ]
+        for p in self.patches:
+            p.start()
+
+        uid = "tsarmed"
+        conditions = {
+            "buy": {k: k == "golden_cross" for k in sv._BUY_KEYS},
+            "sell": {k: k in ("take_profit", "trailing_stop", "stop_loss") for k in sv._SELL_KEYS},
+        }
+        Path(sv._make_conditions_path(sv.MACDStrategy, uid)).write_text(json.dumps(conditions))
+        self.cls = type("TsArmedMACD", (sv.MACDStrategy,), dict(
+            user_id=uid, ticker="KRW-TEST", take_profit=0.005, stop_loss=0.01, min_holding_period=2,
+        ))
+        self.df = _ohlc()
+        # 같은 uid/타임스탬프로 반복 실행 → 프로세스 내 감사 dedup 초기화
+        sv.MACDStrategy._seen_buy_audits = set()
+        sv.MACDStrategy._seen_sell_audits = set()
+        Backtest(self.df, self.cls, cash=1e7, commission=0.0005, exclusive_orders=True).run()
+        self.events = list(sv.MACDStrategy.trade_events)
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        os.chdir(self.cwd)
+
+    def test_trailing_stop_sells_are_armed(self):
+        ts_sells = [e for e in self.events if e["reason"] == "Trailing Stop"]
+        self.assertGreater(len(ts_sells), 0)
+        for e in ts_sells:
+            self.assertTrue(e["ts_armed"], e)
+            self.assertIsNotNone(e["highest"])
+            self.assertGreaterEqual(e["highest"], e["tp"])
+
+    def test_matches_kernel_state(self):
+        sells = [(e["timestamp"], e["ts_armed"]) for e in self.events if e["type"] == "SELL"]
+        fast = self.cls.run_fast(self.df)
+        fast = fast[fast["type"] == "SELL"]
+        self.assertEqual(sells, list(zip(fast["timestamp"], fast["ts_armed"].astype(bool))))
+        # ARM 전에 손절된 매도도 섞여 있어야 False 경로까지 검증됨
+        self.assertIn(False, [armed for _, armed in sells])
+
+    def test_buy_events_start_disarmed(self):
+        for e in self.events:
+            if e["type"] == "BUY":
+                self.assertFalse(e["ts_armed"], e)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+✅ 회귀: 로그 I/O 백그라운드 처리 (enable_queue_logging) (2026-10-18)
+
+변경:
+- engine_runner 가 basicConfig 직후 utils.logging_util.enable_queue_logging() 호출
+  → 루트 핸들러는 QueueHandler 하나, 실제 출력 핸들러는 QueueListener 스레드에서 처리.
+
+본 회귀는
+- 기존 핸들러가 QueueHandler 로 교체되고 레코드가 원래 핸들러까지 전달되는지
+- 중복 호출 시 리스너/핸들러가 한 번만 설치되는지
+- 핸들러가 없는 로거에는 아무것도 하지 않는지
+를 전용 로거로 확인 (루트 로거는 건드리지 않음).
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_queue_logging -v
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import unittest
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from utils import logging_util  # noqa: E402
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestQueueLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger("test_r_queue_logging")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.sink = _ListHandler()
+        self.logger.addHandler(self.sink)
+
+    def tearDown(self):
+        listener = logging_util._queue_listeners.pop(self.logger.name, None)
+        if listener is not None:
+            listener.stop()
+        for h in list(self.logger.handlers):
+            self.logger.removeHandler(h)
+
+    def test_records_reach_original_handler(self):
+        listener = logging_util.enable_queue_logging(self.logger)
+        self.assertIsNotNone(listener)
+        self.assertEqual(len(self.logger.handlers), 1)
+        self.assertIsInstance(self.logger.handlers[0], QueueHandler)
+
+        self.logger.info("bar=%d price=%.1f", 7, 101.5)
+        listener.stop()   # 큐 비우고 스레드 종료
+        logging_util._queue_listeners.pop(self.logger.name)
+        self.assertEqual(self.sink.messages, ["bar=7 price=101.5"])
+
+    def test_idempotent(self):
+        first = logging_util.enable_queue_logging(self.logger)
+        second = logging_util.enable_queue_logging(self.logger)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.logger.handlers), 1)
+
+    def test_no_handlers_noop(self):
+        bare = logging.getLogger("test_r_queue_logging.bare")
+        self.assertIsNone(logging_util.enable_queue_logging(bare))
+        self.assertEqual(bare.handlers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+✅ 회귀: MACDStrategy 이벤트 버퍼 컬럼형(SoA) 전환 호환성 (2026-10-18)
+
+변경:
+- MACDStrategy.log_events / trade_events 가 list 대신
+  core/strategy_events.py 의 LogEventBuffer / TradeEventBuffer 로 적재됨.
+
+본 회귀는 기존 소비자(engine/live_loop_old.py, replay_runner*) 가 쓰는 접근 방식
+— len / reversed / event[0], event[1] / 6-튜플 언패킹 / e.get("bar") / 슬라이싱 —
+이 그대로 동작하는지, 그리고 None 값이 dict 복원 시 None 으로 돌아오는지 확인.
+또한 버퍼가 전략 인스턴스 소유라서 스레드로 병렬 실행한 백테스트끼리 섞이지 않고
+(stats._strategy.trade_events = 단독 실행 결과), 클래스 속성은 마지막 실행을 가리키는
+하위호환 미러로만 남는지 확인.
+
+실행:
+    python3 -m unittest tests.regressions.test_r_2026_10_18_strategy_event_buffers -v
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backtesting import Backtest  # noqa: E402
+
+import core.strategy_v2 as sv  # noqa: E402
+from core.strategy_events import LogEventBuffer, TradeEventBuffer, TRADE_FIELDS, _ColumnBuffer  # noqa: E402
+
+
+def _trade(bar, kind, reason, entry_price=100.0, entry_bar=10):
+    return dict(
+        bar=bar, type=kind, reason=reason, timestamp=f"ts{bar}",
+        price=101.0, macd=0.1, signal=0.05,
+        entry_price=entry_price, entry_bar=entry_bar, bars_held=bar - (entry_bar or bar),
+        tp=None if entry_price is None else entry_price * 1.03,
+        sl=None if entry_price is None else entry_price * 0.99,
+        highest=None, ts_pct=0.02, ts_armed=False,
+    )
+
+
+class TestLogEventBuffer(unittest.TestCase):
+
+    def setUp(self):
+        # 용량보다 많이 적재 → 자동 확장 경로까지 확인
+        self.buf = LogEventBuffer(2)
+        for bar, cross in enumerate(["Neutral", "Golden", "Pending", "Dead", "Neutral"]):
+            self.buf.record(bar, cross, bar * 0.1, bar * 0.05, 100.0 + bar)
+
+    def test_tuple_view(self):
+        self.assertEqual(len(self.buf), 5)
+        self.assertEqual(self.buf[1], (1, "LOG", "Golden", 0.1, 0.05, 101.0))
+        bar, kind, cross, macd, signal, price = self.buf[-1]
+        self.assertEqual((bar, kind, cross, price), (4, "LOG", "Neutral", 104.0))
+
+    def test_reversed_and_slice(self):
+        self.assertEqual([e[0] for e in reversed(self.buf)], [4, 3, 2, 1, 0])
+        self.assertEqual([e[2] for e in self.buf[1:3]], ["Golden", "Pending"])
+
+    def test_to_frame(self):
+        df = self.buf.to_frame()
+        self.assertEqual(list(df["bar"]), [0, 1, 2, 3, 4])
+        self.assertEqual(list(df["cross"].astype(str)), ["Neutral", "Golden", "Pending", "Dead", "Neutral"])
+
+
+class TestLogEventRing(unittest.TestCase):
+    """maxlen 지정 시 deque(maxlen) 처럼 최근 이벤트만 유지"""
+
+    def setUp(self):
+        self.buf = LogEventBuffer(2, maxlen=3)
+        for bar in range(7):
+            self.buf.record(bar, "Neutral", 0.0, 0.0, 100.0 + bar)
+
+    def test_keeps_latest(self):
+        self.assertEqual(len(self.buf), 3)
+        self.assertEqual([e[0] for e in self.buf], [4, 5, 6])
+        self.assertEqual([e[0] for e in reversed(self.buf)], [6, 5, 4])
+        self.assertEqual(self.buf[-1][5], 106.0)
+        self.assertEqual([e[0] for e in self.buf[1:]], [5, 6])
+
+    def test_to_frame_order(self):
+        self.assertEqual(list(self.buf.to_frame()["bar"]), [4, 5, 6])
+
+
+class TestTradeEventBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buf = TradeEventBuffer(capacity=1)
+        self.rows = [
+            _trade(10, "BUY", "golden_cross"),
+            _trade(15, "SELL", "Take Profit"),
+            _trade(20, "SELL", "Stop Loss", entry_price=None, entry_bar=None),
+        ]
+        for r in self.rows:
+            self.buf.record(**r)
+
+    def test_dict_roundtrip(self):
+        self.assertEqual(list(self.buf), self.rows)
+        self.assertEqual(tuple(self.buf[0].keys()), TRADE_FIELDS)
+
+    def test_consumer_access(self):
+        self.assertEqual([e for e in self.buf if e.get("bar") == 15][0]["reason"], "Take Profit")
+        self.assertEqual(len(self.buf[:2]), 2)
+        self.assertIsNone(self.buf[2]["entry_bar"])
+        self.assertIsNone(self.buf[2]["tp"])
+
+    def test_to_frame(self):
+        df = self.buf.to_frame()
+        self.assertEqual(list(df.columns), list(TRADE_FIELDS))
+        self.assertEqual(list(df["type"]), ["BUY", "SELL", "SELL"])
+        self.assertTrue(df["entry_bar"].isna().iloc[2])
+
+
+class TestColumnBufferContract(unittest.TestCase):
+
+    def test_missing_hook_fails_at_instantiation(self):
+        class NoRow(_ColumnBuffer):
+            _columns = ("bar",)
+
+            def _alloc(self, cap):
+                self.bar = np.empty(cap, dtype=np.int64)
+
+        with self.assertRaises(TypeError):
+            NoRow(4)
+
+
+class TestInstanceOwnedBuffers(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="event_buffers_")
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.patches = [
+            mock.patch.object(sv, "insert_buy_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "insert_sell_evals_many", lambda *a, **kw: None),
+            mock.patch.object(sv, "has_open_by_orders", lambda *a, **kw: False),
+        ]
+        for p in self.patches:
+            p.start()
+        sv.MACDStrategy._seen_buy_audits = set()
+        sv.MACDStrategy._seen_sell_audits = set()
+        uid = "buffers"
+        conditions = {
+            "buy": {k: k == "golden_cross" for k in sv._BUY_KEYS},
+            "sell": {k: k in ("take_profit", "stop_loss") for k in sv._SELL_KEYS},
+        }
+        Path(sv._make_conditions_path(sv.MACDStrategy, uid)).write_text(json.dumps(conditions))
+        self.cls = type("BufferMACD", (sv.MACDStrategy,), dict(
+            user_id=uid, ticker="KRW-TEST", take_profit=0.005, stop_loss=0.005,
+        ))
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        os.chdir(self.cwd)
+
+    def _df(self, seed):
+        # 실행마다 다른 날짜 → 프로세스 내 감사 dedup 키(봉 시각)가 실행끼리 겹치지 않음
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, 1200)))
+        return pd.DataFrame({
+            "Open": np.r_[close[0], close[:-1]], "High": close * 1.002, "Low": close * 0.998,
+            "Close": close, "Volume": 1.0,
+        }, index=pd.date_range(f"2026-01-{seed:02d}", periods=len(close), freq="min"))
+
+    def _run(self, df):
+        stats = Backtest(df, self.cls, cash=1e7, commission=0.0005, exclusive_orders=True).run()
+        return stats._strategy
+
+    def test_parallel_runs_do_not_share_buffers(self):
+        dfs = [self._df(seed) for seed in (1, 2, 3, 4)]
+        expected = []
+        for df in dfs:
+            strat = self._run(df)
+            expected.append((list(strat.trade_events), list(strat.log_events)))
+        self.assertTrue(all(trades for trades, _ in expected))
+        sv.MACDStrategy._seen_buy_audits = set()
+        sv.MACDStrategy._seen_sell_audits = set()
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            strategies = list(ex.map(self._run, dfs))
+        for strat, (trades, logs) in zip(strategies, expected):
+            self.assertEqual(list(strat.trade_events), trades)
+            self.assertEqual(list(strat.log_events), logs)
+
+    def test_class_mirror_points_to_last_run(self):
+        first = self._run(self._df(1))
+        first_events = list(first.trade_events)
+        last = self._run(self._df(2))
+        self.assertEqual(list(first.trade_events), first_events)
+        self.assertIs(sv.MACDStrategy.trade_events, last.trade_events)
+        self.assertIs(sv.MACDStrategy.log_events, last.log_events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+"""
+numba 선택 의존성 래퍼
+- numba 가 설치되어 있으면 njit/prange 를 그대로 사용
+- 없으면 njit 는 아무것도 하지 않는 데코레이터, prange 는 range 로 대체
+  (같은 코드가 순수 파이썬으로 동작 — 결과 동일, 속도만 느림)
+"""
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """@njit / @njit(...) / njit(signature, ...) 모두 지원하는 no-op 데코레이터"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def wrap(fn):
+            return fn
+
+        return wrap
@@ -1,10 +1,54 @@
+import atexit
+import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from services.db import fetch_logs
 
 
 LOG_FILE_PATH = "engine_debug.log"
 
+# 로거 이름 → 실행 중인 QueueListener (중복 적용 방지)
+_queue_listeners: dict[str, QueueListener] = {}
+
+
+def enable_queue_logging(target: logging.Logger | None = None) -> QueueListener | None:
+    """
+    로거(기본: 루트)의 핸들러를 QueueHandler 하나로 교체하고,
+    기존 핸들러(콘솔/파일)는 백그라운드 QueueListener 스레드에서 처리한다.
+    - 전략 봉 루프에서는 레코드 enqueue 만 수행 (write/flush 는 리스너 스레드)
+    - 같은 로거에 여러 번 호출해도 1회만 적용, 프로세스 종료 시 남은 레코드 flush
+    - 옮길 핸들러가 없으면(basicConfig 전) 아무것도 하지 않고 None
+    """
+    target = target or logging.getLogger()
+    listener = _queue_listeners.get(target.name)
+    if listener is not None:
+        return listener
+
+    handlers = [h for h in target.handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        return None
+
+    q = queue.SimpleQueue()
+    for h in handlers:
+        target.removeHandler(h)
+    target.addHandler(QueueHandler(q))
+
+    listener = QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    if not _queue_listeners:
+        atexit.register(_stop_queue_listeners)
+    _queue_listeners[target.name] = listener
+    return listener
+
+
+def _stop_queue_listeners():
+    """종료 시 큐에 남은 레코드를 모두 출력하고 리스너 스레드 정리"""
+    while _queue_listeners:
+        _, listener = _queue_listeners.popitem()
+        listener.stop()
+
 
 def init_log_file(user_id: str):
     path = f"{user_id}_{LOG_FILE_PATH}"